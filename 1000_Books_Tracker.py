@@ -1,13 +1,23 @@
+import time
+LAUNCHED = time.perf_counter() # Start of time-to-first-paint
+
 import os
 import sys
-import csv
-import requests
+from datetime import date, datetime
+from collections import OrderedDict
 from dotenv import load_dotenv
-from Book_Result_Widget import BookResultWidget
-from PyQt5.QtCore import Qt, QSize
-from PyQt5.QtNetwork import QNetworkAccessManager
-from PyQt5.QtGui import QPixmap, QColor, QIcon, QPainter, QPainterPath
-from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QLineEdit, QPushButton, QLabel, QTextEdit, QStackedWidget, QListWidget, QVBoxLayout, QHBoxLayout, QSizePolicy, QScrollArea, QProgressBar, QGridLayout)
+from http_client import POOL_SIZE as HTTP_POOL_SIZE
+from book_storage import BookStorage
+from book_journal import BookJournal
+from history_loader import load_history, book_key
+from reader_roster import ReaderRoster
+from Readers_Page import ReaderListModel, ReadersPage
+from image_pipeline import shared_pipeline
+from instrumentation import instruments
+from theme import apply_theme, set_style_property
+from PyQt5.QtCore import Qt, QSize, QTimer, pyqtSignal
+from PyQt5.QtGui import QIcon, QKeySequence
+from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QLineEdit, QPushButton, QLabel, QStackedWidget, QVBoxLayout, QHBoxLayout, QScrollArea, QFileDialog, QShortcut, QMessageBox)
 
 
 
@@ -23,8 +33,34 @@ TWILIO_ACCOUNT_SID = os.getenv("TWILIO_ACCOUNT_SID")
 OPEN_LIBRARY_URL = os.getenv("OPEN_LIBRARY_URL")
 OPEN_LIBRARY_SEARCH = os.getenv("OPEN_LIBRARY_SEARCH")
 OPEN_LIBRARY_COVER = os.getenv("OPEN_LIBRARY_COVER")
+OPEN_LIBRARY_BOOKS = os.getenv("OPEN_LIBRARY_BOOKS", "https://openlibrary.org/api/books")
+
+# Offline catalog built by local_catalog.py, used before OpenLibrary when present
+LOCAL_CATALOG = os.getenv("LOCAL_CATALOG", "catalog.db")
+# How often instrumentation snapshots are appended to the metrics log
+METRICS_INTERVAL_MS = int(float(os.getenv("BOOKTRACKER_METRICS_INTERVAL", "10")) * 1000)
+
+# Results fetched per OpenLibrary request, more pages load as the user scrolls
+SEARCH_PAGE_SIZE = 20
+
+# Live search waits this long after the last keystroke
+SEARCH_DEBOUNCE_MS = 300
+MIN_LIVE_QUERY_LENGTH = 3
+# Refining the previous results locally is only good enough if this many still match
+MIN_LOCAL_RESULTS = 5
+
+# Book List pages kept alive for quick reopening
+MAX_CACHED_BOOK_LISTS = 3
+
+# Launch to first painted frame, a slower start is reported on stderr
+FIRST_PAINT_BUDGET_MS = float(os.getenv("BOOKTRACKER_FIRST_PAINT_BUDGET_MS", "300"))
+
+# Stack slots, each page is built the first time it is shown
+READERS_PAGE, LIBRARY_PAGE, NOTIFICATIONS_PAGE, ABOUT_PAGE, BOOK_LISTS_PAGE = range(5)
 
 class BookTracker(QMainWindow):
+    journal_failed = pyqtSignal() # Emitted from the journal's writer thread, handled on the GUI thread
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("1000 Books Before Kindergarten Tracker")
@@ -39,36 +75,52 @@ class BookTracker(QMainWindow):
         self.header = QLabel("Readers", alignment=Qt.AlignLeft)
         self.header.setObjectName("header")
         main.addWidget(self.header)
-        
-        self.setStyleSheet("""
-            QLabel#header{
-                font-size:60px; 
-                font-weight:bold;
-                height: 100px;
-                width: 500px;
-                padding-top: 70px;
-            }
-        """)
 
-         # Dictionary to track each reader and count
-        self.readers = {
-            "Bellamy": {"count": 247, "image": "/Users/brettonpelagalli/Documents/VSC Projects/Python/images/bellamy.jpeg"},
-            "Marceline": {"count": 500, "image": "/Users/brettonpelagalli/Documents/VSC Projects/Python/images/marceline.jpeg"}
+        # One application stylesheet, parsed once; tabs and widgets only change properties
+        apply_theme(QApplication.instance())
+
+        # Reading history lives in SQLite, an old books_read.csv is imported on first launch
+        self.storage = BookStorage("books_read.db")
+        self.storage.import_csv("books_read.csv")
+
+        # New readings are written in batches off the GUI thread
+        self.journal = BookJournal(
+            "books_read.db",
+            flush_interval=float(os.getenv("BOOK_JOURNAL_FLUSH_SECONDS", "1.0")),
+            durability=os.getenv("BOOK_JOURNAL_DURABILITY", "batch"),
+            on_failure=lambda book, error: self.journal_failed.emit())
+        self.reported_failures = 0
+        self.journal_failed.connect(self.report_unsaved_books)
+
+        # Rebuild counts from the history so they never drift from what was logged
+        self.history = load_history(self.storage)
+
+        # Readers are saved with the books, counts are "start" plus the saved history
+        self.roster = ReaderRoster(self.storage, self.history, self.journal)
+        self.reader_model = ReaderListModel(self.roster, self)
+        self.reader_model.reader_renamed.connect(self.reader_renamed)
+        self.reader_model.reader_removed.connect(self.reader_removed)
+
+        # Stacked widget to hold different pages/tabs.
+        # Every slot starts as an empty placeholder and gets its page on first visit.
+        self.page_builders = {
+            READERS_PAGE: self.readers_page,
+            LIBRARY_PAGE: self.library_page,
+            NOTIFICATIONS_PAGE: self.notifications_page,
+            ABOUT_PAGE: self.about_page,
+            BOOK_LISTS_PAGE: self.book_lists_page
         }
-
-        self.books_read = []
-
-        # Stacked widget to hold different pages/tabs
+        self.built_pages = set()
         self.stack = QStackedWidget()
-        self.stack.insertWidget(0, self.readers_page())
-        #self.stack.insertWidget(1, self.library_widget)
-        self.stack.addWidget(self.library_page())
-        self.stack.addWidget(self.notifications_page())
-        self.stack.addWidget(self.about_page())
+        for _ in self.page_builders:
+            self.stack.addWidget(QWidget())
+        self.book_list_pages = OrderedDict() # reader -> cached BookListPage
         main.addWidget(self.stack)
+        self.first_paint_ms = None
 
         # Footer nav bar
         self.footer_container = QWidget()
+        self.footer_container.setObjectName("footer")
         footer = QHBoxLayout(self.footer_container)
         footer.setContentsMargins(0,0,0,0)
         footer.setSpacing(12)
@@ -91,40 +143,57 @@ class BookTracker(QMainWindow):
             button.setIconSize(QSize(32, 32))
             button.setFixedSize(60, 60)
             button.setCursor(Qt.PointingHandCursor)
-            button.setStyleSheet("""
-                QPushButton{
-                    border-radius:30px;
-                    background-color: none;
-                    border: none;
-                }
-                
-                QPushButton:hover {
-                    background-color: #ede4e4;            
-                }
-
-                QPushButton:pressed {
-                    background-color: #bfb6b6;            
-                }
-            """)
-
+            button.setObjectName("navButton")
             button.clicked.connect(lambda _, i=index: self.switch_to(i))
             footer.addWidget(button)
         
         main.addWidget(self.footer_container)
         self.setCentralWidget(central)
-        
-        # Background colors for each tab
-        self.tab_colors = {
-            0: "#487347",
-            1: "#5478ab",
-            2: "#cf9851",
-            3: "#ab616e"
-        
-        }
-        # Always start on Readers tab
-        self.switch_to(0)
+        self.setup_instrumentation()
 
-        self.search_input.returnPressed.connect(self.perform_search)
+        # Always start on Readers tab
+        self.switch_to(READERS_PAGE)
+
+    # Records launch to first frame once, against FIRST_PAINT_BUDGET_MS
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if self.first_paint_ms is None:
+            self.first_paint_ms = (time.perf_counter() - LAUNCHED) * 1000
+            instruments.record("startup.first_paint", self.first_paint_ms / 1000)
+            if self.first_paint_ms > FIRST_PAINT_BUDGET_MS:
+                print(f"First paint took {self.first_paint_ms:.0f} ms, budget is {FIRST_PAINT_BUDGET_MS:.0f} ms",
+                      file=sys.stderr)
+
+    # Builds the page in slot `index` if this is its first visit
+    def page(self, index):
+        if index not in self.built_pages:
+            self.built_pages.add(index)
+            with instruments.timer(f"page.build.{index}"):
+                placeholder = self.stack.widget(index)
+                self.stack.insertWidget(index, self.page_builders[index]())
+                self.stack.removeWidget(placeholder)
+                placeholder.deleteLater()
+        return self.stack.widget(index)
+
+    # Periodic metrics snapshots and the F12 debug overlay, only when BOOKTRACKER_METRICS=1
+    def setup_instrumentation(self):
+        if not instruments.enabled:
+            return
+        instruments.gauge("widgets.alive", lambda: len(QApplication.allWidgets()))
+        instruments.gauge("results.rows", lambda: self.results_model.rowCount() if hasattr(self, "results_model") else 0)
+        instruments.gauge("book_lists.cached", lambda: len(self.book_list_pages))
+        instruments.gauge("journal.queued", self.journal.queue.qsize)
+
+        self.metrics_timer = QTimer(self)
+        self.metrics_timer.setInterval(METRICS_INTERVAL_MS)
+        self.metrics_timer.timeout.connect(instruments.write_snapshot)
+        self.metrics_timer.start()
+
+        from Metrics_Overlay import MetricsOverlay
+        self.metrics_overlay = MetricsOverlay(self.centralWidget())
+        QShortcut(QKeySequence("F12"), self, self.metrics_overlay.toggle)
+        if os.getenv("BOOKTRACKER_METRICS_OVERLAY", "0") == "1":
+            self.metrics_overlay.show()
 
     # Creates a placeholder page with centered text
     def _page(self, text):
@@ -134,18 +203,13 @@ class BookTracker(QMainWindow):
         return window
 
     # Switches between tabs and updates header and footer
-    def switch_to(self, index):
+    def switch_to(self, index, title=None):
+        self.page(index)
         self.stack.setCurrentIndex(index)
-        self.header.setText(self.button_names[index][0])
-        color = self.tab_colors.get(index,"#999da1") # fallback color
-        self.header.setStyleSheet(f"""
-            font-size: 30px;
-            font-weight: bold;
-            height: 300px;
-            width: 500px;
-            background-color: {color};
-             """)
-        self.footer_container.setStyleSheet(f"background-color: {color};")
+        self.header.setText(title or self.button_names[index][0])
+        # Tab colors come from theme.TAB_COLORS through the "tab" property
+        set_style_property(self.header, "tab", index)
+        set_style_property(self.footer_container, "tab", index)
 
 
 
@@ -158,149 +222,38 @@ class BookTracker(QMainWindow):
 
 
 
-    # Readers page which shows name, progress bar, and add button
+    # Readers page which shows name, progress bar, and add button for every reader
     def readers_page(self):
-
-        scroll_area = QScrollArea()
-        scroll_area.setWidgetResizable(True)
-
-        content_widget = QWidget()
-        layout = QVBoxLayout(content_widget)
-        layout.setSpacing(20)
-
-        for name, data in self.readers.items():
-            count = data["count"]
-            image_path = data["image"]
-
-            # Container for reader
-            reader_box = QWidget()
-            reader_layout = QVBoxLayout(reader_box)
-
-            # Info box holds image, labels, and progress
-            info_box = QWidget()
-            info_layout = QVBoxLayout(info_box)
-            info_layout.setSpacing(8)
-
-
-            # Profile picture
-            image_label = QLabel()
-            pixmap = QPixmap(image_path)
-            if not pixmap.isNull():
-                size = 64
-                pixmap = pixmap.scaled(size, size, Qt. KeepAspectRatioByExpanding, Qt.SmoothTransformation)
-                mask = QPixmap(size,size)
-                mask.fill(Qt.transparent)
-
-                rounded = QPixmap(size, size)
-                rounded.fill(Qt.transparent)
-
-                painter = QPainter(rounded)
-                painter.setRenderHint(QPainter.Antialiasing)
-
-                path = QPainterPath()
-                path.addEllipse(0, 0, size, size)
-                painter.setClipPath(path)
-                painter.drawPixmap(0, 0, pixmap)
-                painter.end()
-            
-                image_label.setPixmap(rounded)
-
-            else:
-                image_label.setText("No Image")
-            image_label.setFixedSize(64, 64)
-            info_layout.addWidget(image_label)
-
-            # Reader name
-            name_label = QLabel(f"{name}")
-            name_label.setStyleSheet("font-size: 18px; font-weight: bold;")
-            info_layout.addWidget(name_label)
-
-            # Progress text
-            progress_label = QLabel(f"{count}/1000 books read")
-            info_layout.addWidget(progress_label)
-
-            # Progress bar
-            progress_bar = QProgressBar()
-            progress_bar.setFixedHeight(20)
-            progress_bar.setMaximum(1000)
-            progress_bar.setValue(count)
-            progress_bar.setTextVisible(False)
-            progress_bar.setStyleSheet("""
-                QProgressBar {
-                    background-color: #d2d4d3;
-                    border-radius: 10px;
-                }
-                QProgressBar::chunk {
-                    background-color: #487347;
-                    border-radius: 10px;                    
-                }     
-            """)
-            info_layout.addWidget(progress_bar)
-
-            # Add book and book list buttons
-            buttons_box = QWidget()
-            buttons_layout = QHBoxLayout(buttons_box)
-            buttons_layout.setSpacing(10)
-            buttons_layout.setContentsMargins(0, 0, 0, 0)
-
-            add_button = QPushButton("Finished A Book")
-            add_button.setCursor(Qt.PointingHandCursor) 
-            add_button.setStyleSheet("""
-                QPushButton {
-                    background-color: #487347;
-                    color: white;
-                    padding: 6px 12px;
-                    border-radius: 14px;
-                }
-                QPushButton:hover {
-                    background-color: rgba(72, 115, 71, 0.9);           
-                }
-            """)
-            add_button.clicked.connect(lambda _, r=name: self.add_books(r))
-            buttons_layout.addWidget(add_button)
-
-            book_list_button = QPushButton("Book List")
-            book_list_button.setCursor(Qt.PointingHandCursor)
-            book_list_button.setStyleSheet("""
-                QPushButton {
-                    background-color: white ;
-                    color: #487347;
-                    padding: 6px 12px;
-                    border-radius: 14px;
-                }
-                QPushButton:hover {
-                    background-color: #487347;
-                    color: white;            
-                }
-            """)
-
-            book_list_button.clicked.connect(lambda _, r=name: self.show_book_list(r))
-            buttons_layout.addWidget(book_list_button)
-
-            info_layout.addWidget(buttons_box)
-
-
-
-            # Add info box to reader layout
-            reader_layout.addWidget(info_box)
-
-            # Add reader box to main layout
-            layout.addWidget(reader_box)
-
-        scroll_area.setWidget(content_widget)
-        return scroll_area
+        return ReadersPage(self.reader_model, self.add_books, self.show_book_list)
+
+    # Keeps the current reader and any cached Book List in step with a renamed reader
+    def reader_renamed(self, old_name, new_name):
+        if getattr(self, "current_reader", None) == old_name:
+            self.current_reader = new_name
+        self.drop_book_list(old_name)
+
+    def reader_removed(self, name):
+        if getattr(self, "current_reader", None) == name:
+            self.current_reader = None
+        self.drop_book_list(name)
+
+    def drop_book_list(self, reader_name):
+        page = self.book_list_pages.pop(reader_name, None)
+        if page is not None:
+            self.book_list_stack.removeWidget(page)
+            page.deleteLater()
     
     # Increases book count for reader and refreshes page
     def add_books(self, reader_name):
         self.current_reader = reader_name # Stores which child is active
-        if not hasattr(self, "library_widget"):
-            self.library_widget = self.library_page()
-            self.stack.addWidget(self.library_widget)
-        self.switch_to(self.stack.indexOf(self.library_widget))
+        self.switch_to(LIBRARY_PAGE)
         
 
     
     def library_page(self):
+        from Search_Results_View import SearchResultsModel, SearchResultsView
+        from result_ranker import ResultRanker
+
         self.library_widget = QWidget()
         main_layout = QVBoxLayout(self.library_widget)
         self.library_widget.setLayout(main_layout)
@@ -314,179 +267,404 @@ class BookTracker(QMainWindow):
         # Search bar and button
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText("Search by title, author, or ISBN")
-        self.search_input.setStyleSheet("""
-            font: 14px;
-            height: 30px; 
-            border-top-left-radius: 15px;
-            border-bottom-left-radius: 15px;
-            padding: 2px 15px;
-        """)
+        self.search_input.setObjectName("searchInput")
         search_layout.addWidget(self.search_input)
 
         search_button = QPushButton("Search")
         search_button.setCursor(Qt.PointingHandCursor)
-        search_button.setStyleSheet("""
-            QPushButton{ 
-                font: 14px;                       
-                height: 30px;
-                border-top-right-radius: 15px;
-                border-bottom-right-radius: 15px;
-                background-color: #5478ab;  
-                padding: 2px 10px; 
-                                   
-            }
-            QPushButton:hover{
-                background-color: rgba(84, 120, 171, 0.9);                
-            }
-            QPushButton:pressed{
-                background-color: rgba(84, 120, 171, 0.7);                     
-            }
-        """)
+        search_button.setObjectName("searchButton")
         search_button.clicked.connect(self.perform_search)
         search_layout.addWidget(search_button)
 
         main_layout.addWidget(search_row, 0)
 
-        # Scrollable results area
-        scroll_area = QScrollArea()
-        scroll_area.setWidgetResizable(True)
+        # Logs a whole file of ISBNs to the current reader, clicking again while it runs cancels it
+        self.import_button = QPushButton("Import ISBN list")
+        self.import_button.setCursor(Qt.PointingHandCursor)
+        self.import_button.clicked.connect(self.import_isbn_file)
+        main_layout.addWidget(self.import_button, 0, Qt.AlignRight)
+        self.isbn_import = None # Callback of the import still resolving
+        self.isbn_lookup = None # Callback of the ISBN search still resolving
+
+        # Message shown while loading or when nothing matched
+        self.results_message = QLabel()
+        self.results_message.setAlignment(Qt.AlignCenter)
+        self.results_message.hide()
+        main_layout.addWidget(self.results_message)
+
+        # Virtualized results list, rows are painted by a delegate instead of one widget per book
+        self.ranker = ResultRanker()
+        self.superset_query = "" # Last query fetched from the network and its raw docs
+        self.superset_docs = []
+        self.results_model = SearchResultsModel(parent=self)
+        self.results_model.more_requested.connect(self.load_more_results)
+        self.results_view = SearchResultsView()
+        self.results_view.setModel(self.results_model)
+        self.results_view.delegate.read_clicked.connect(self.add_book_to_reader)
+        self.results_view.delegate.times_read = self.times_read
+        if hasattr(self, 'cover_downloader'):
+            self.results_model.downloader = self.cover_downloader
+            self.results_model.cover_cache = self.cover_cache
 
-        results_container = QWidget()
-        self.results_area = QVBoxLayout(results_container)
-        results_container.setLayout(self.results_area)
+        self.search_input.returnPressed.connect(self.perform_search)
 
-        scroll_area.setWidget(results_container)
+        # Search as you type, at most one search per pause in typing
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(self.live_search)
+        self.search_input.textEdited.connect(self.search_timer.start)
 
-        main_layout.addWidget(scroll_area, 1)
+        main_layout.addWidget(self.results_view, 1)
 
         return self.library_widget
     
+    # Creates the network manager and the cover cache/downloader shared by every list
+    def setup_covers(self):
+        from network_manager import PooledNetworkManager
+        from cover_cache import CoverCache
+        from cover_downloader import CoverDownloader
+
+        if not hasattr(self, 'network_manager'):
+            self.network_manager = PooledNetworkManager(self)
+        if not hasattr(self, 'cover_cache'):
+            self.cover_cache = CoverCache()
+        if not hasattr(self, 'cover_downloader'):
+            self.cover_downloader = CoverDownloader(self.network_manager, max_per_host=HTTP_POOL_SIZE, parent=self)
+            if hasattr(self, 'results_model'):
+                self.results_model.downloader = self.cover_downloader
+                self.results_model.cover_cache = self.cover_cache
+            instruments.gauge("covers.in_flight", self.cover_downloader.in_flight)
+            instruments.gauge("covers.queued", lambda: len(self.cover_downloader.pending))
+            instruments.gauge("covers.decoding", lambda: len(self.cover_cache.pipeline.waiting))
+            instruments.gauge("cover_cache", lambda: {
+                "hits": self.cover_cache.hits, "disk_hits": self.cover_cache.disk_hits,
+                "misses": self.cover_cache.misses,
+                "hit_rate": self.cover_cache.hits / max(1, self.cover_cache.hits + self.cover_cache.misses)})
+
+    def cover_url(self, cover_id):
+        return f"{OPEN_LIBRARY_COVER}/{cover_id}-M.jpg" if cover_id else None
+
+    # Runs once typing pauses, refining the last results locally when the query just got longer
+    def live_search(self):
+        from result_ranker import query_extends
+
+        query = self.search_input.text().strip().lower()
+        if len(query) < MIN_LIVE_QUERY_LENGTH or query == self.results_model.query:
+            return
+
+        # Only a literal extension whose every new word is in some fetched doc is refined here,
+        # refine returns nothing otherwise and OpenLibrary is asked instead
+        if query_extends(self.superset_query, query):
+            refined = self.ranker.refine(query, self.superset_docs)
+            if len(refined) >= MIN_LOCAL_RESULTS:
+                self.clear_results()
+                self.results_model.reset(query)
+                # Local results only, Enter or Search still asks OpenLibrary for the full list
+                self.results_model.append_page(self.docs_to_books(refined), 0, False)
+                return
+
+        self.perform_search()
+
+    # Creates the network manager, search client and ISBN resolver on first use
+    def setup_search(self):
+        from search_client import SearchClient
+        from search_cache import SearchCache
+        from local_catalog import open_local_catalog
+        from isbn_resolver import IsbnResolver
+
+        self.setup_covers()
+        if not hasattr(self, 'search_client'):
+            self.search_client = SearchClient(
+                OPEN_LIBRARY_SEARCH, self.network_manager, cache=SearchCache(),
+                local_catalog=open_local_catalog(LOCAL_CATALOG),
+                remote_fallback=os.getenv("LOCAL_CATALOG_REMOTE_FALLBACK", "1") == "1",
+                parent=self)
+            self.search_client.results_ready.connect(self.show_search_results)
+            self.search_client.search_failed.connect(self.show_search_error)
+            instruments.gauge("search_cache", self.search_client.cache.stats)
+        if not hasattr(self, 'isbn_resolver'):
+            self.isbn_resolver = IsbnResolver(
+                OPEN_LIBRARY_BOOKS, self.network_manager, cache=SearchCache("cache/isbn_cache.sqlite3"),
+                max_in_flight=HTTP_POOL_SIZE, parent=self)
+            instruments.gauge("isbn_cache", self.isbn_resolver.cache.stats)
+            instruments.gauge("isbn.in_flight", self.isbn_resolver.in_flight)
+
     def perform_search(self):
+        self.search_timer.stop()
         query = self.search_input.text().strip().lower()
         if not query:
             return
-        
-        # Clear existing results
-        while self.results_area.count():
-            item = self.results_area.takeAt(0)
-            widget = item.widget()
-            if widget is not None:
-                widget.deleteLater()
-        
-        # Show loading message
-        loading_label = QLabel("Loading results...")
-        loading_label.setAlignment(Qt.AlignCenter)
-        self.results_area.addWidget(loading_label)
-        QApplication.processEvents()
+        self.setup_search()
+        from isbn_resolver import parse_isbn
+
+        # Show loading message until the first page arrives
+        self.clear_results()
+        self.results_model.reset(query)
+        self.show_results_message("Loading results...")
+
+        # An ISBN is looked up directly, in the offline catalog first and then with the
+        # Books API, full-text search is only the fallback
+        if self.isbn_lookup is not None: # Superseded, its answer would be dropped anyway
+            self.isbn_resolver.cancel(self.isbn_lookup)
+            self.isbn_lookup = None
+        isbn = parse_isbn(query)
+        if isbn:
+            self.search_client.cancel()
+            docs = self.search_client.search_local(isbn, SEARCH_PAGE_SIZE)
+            if docs:
+                self.show_search_results(query, docs, 0)
+                return
+            self.isbn_lookup = lambda _, doc, error: self.show_isbn_result(query, doc, error)
+            self.isbn_resolver.resolve([isbn], self.isbn_lookup)
+            return
 
-        # Create network manager
-        if not hasattr(self, 'network_manager'):
-            self.network_manager = QNetworkAccessManager()
-            
-        try:
-            url = f"{OPEN_LIBRARY_SEARCH}?q={requests.utils.quote(query)}&limit=20"
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            data = response.json()
+        # Any older search still in flight is cancelled by the client
+        self.search_client.search(query, limit=SEARCH_PAGE_SIZE)
 
-            # Remove loading message
-            self.results_area.removeWidget(loading_label) 
-            loading_label.deleteLater()
+    def show_isbn_result(self, query, doc, error):
+        self.isbn_lookup = None
+        if query != self.results_model.query:
+            return
+        if doc is None:
+            self.search_client.search(query, limit=SEARCH_PAGE_SIZE)
+            return
+        self.show_search_results(query, [doc], 0)
+
+    # Asks for the next page once the results view nears the bottom
+    def load_more_results(self):
+        self.results_model.loading = True
+        self.search_client.search(self.results_model.query, limit=SEARCH_PAGE_SIZE, offset=self.results_model.next_offset)
+
+    # Empties the results list and drops its cover downloads
+    def clear_results(self):
+        if hasattr(self, 'cover_downloader'):
+            self.cover_downloader.cancel_owner(self.results_model)
+        self.results_model.reset("")
+        self.results_message.hide()
+
+    def show_results_message(self, text):
+        self.results_message.setText(text)
+        self.results_message.show()
+
+    def show_search_error(self, query, error):
+        self.results_model.loading = False
+        self.show_results_message(f"Search failed: {error}")
+
+    # Called by the search client with one page of docs for the latest query only
+    def show_search_results(self, query, docs, offset):
+        if query != self.results_model.query:
+            return
 
-            docs = data.get("docs, []")
-        
-        for doc in data.get("docs", []):
-            title = doc.get("title", "").lower()
-            authors = [a.lower() for a in doc.get("author_name", [])]
-            isbn_list = [i.lower() for i in doc.get ("isbn", [])]
+        # Everything fetched for this query is kept for refining as the user keeps typing
+        if offset == 0:
+            self.superset_query = query
+            self.superset_docs = []
+        self.superset_docs.extend(docs)
 
-            # Exact isbn match first
-            if query in isbn_list:
-                isbn_matches.append(doc)
-            elif query in title or any (query in a for a in authors):
-                filtered_results.append(doc)
+        with instruments.timer("search.render"):
+            # Exact ISBN matches first, then by typo-tolerant title/author similarity, nothing dropped
+            books = self.docs_to_books(self.ranker.rank(query, docs))
 
-        final_results = isbn_matches + filtered_results
+            # A short page means OpenLibrary has nothing further
+            has_more = len(docs) >= SEARCH_PAGE_SIZE
+            self.results_model.append_page(books, offset + len(docs), has_more)
 
+        if self.results_model.rowCount():
+            self.results_message.hide()
+        else:
+            self.show_results_message("No results found")
 
-        # Limit to 20 results
-        for doc in final_results [:20]:
+    # Turns OpenLibrary docs into the book dicts the results list shows
+    def docs_to_books(self, docs):
+        books = []
+        for doc in docs:
             title = doc.get("title", "Unknown Title")
             authors = ", ".join(doc.get("author_name", []))
             isbn = doc.get("isbn", [None])[0] if doc.get("isbn") else None
             cover_id = doc.get("cover_i")
-            thumbnail = f"{OPEN_LIBRARY_COVER}/{cover_id}-M.jpg" if cover_id else None
+            thumbnail = self.cover_url(cover_id)
 
             book = {
                 "title": title,
                 "author": authors,
                 "isbn": isbn,
+                "cover_id": cover_id,
                 "thumbnail": thumbnail
             }
-
-            book_widget = BookResultWidget(book, self.add_book_to_reader)
-            self.results_area.addWidget(book_widget)
-        
+            books.append(book)
+        return books
             
     def add_book_to_reader(self, book):
-        reader_name = self.current_reader
-        self.readers[reader_name]["count"] += 1
-    
+        if getattr(self, "current_reader", None) is None:
+            self.show_results_message("Pick a reader on the Readers tab first")
+            return
+        self.log_book(self.current_reader, book)
+        self.switch_to(READERS_PAGE)
+
+    # Times the current reader has read a book, from the in-memory history counters
+    def times_read(self, book):
+        reader_name = getattr(self, "current_reader", None)
+        if reader_name is None:
+            return 0
+        return self.history.times_read(reader_name, book_key(book.get("isbn"), book.get("title")))
+
+    # Records one reading of a search result for the reader
+    def log_book(self, reader_name, book):
         book_entry = {
             "title": book["title"],
             "author": book["author"],
             "isbn": book["isbn"],
+            "cover_id": book.get("cover_id"),
+            "thumbnail": book.get("thumbnail"),
             "reader": reader_name,
-            "count": 1
+            "date_read": date.today().isoformat()
         }
+        self.save_book(book_entry)
+
+        # An open Book List gets the new tile instead of being rebuilt
+        if reader_name in self.book_list_pages:
+            self.book_list_pages[reader_name].add_book(book_entry)
+        # The in-memory history keeps one small slot per reading and the repeat counts
+        self.history.apply(reader_name, book_key(book_entry["isbn"], book_entry["title"]),
+                           title=book_entry["title"], author=book_entry["author"], date_read=book_entry["date_read"])
+        instruments.count("books.logged")
+
+        # Update just this reader's card and the roster totals in place
+        self.reader_model.log_book(reader_name)
+
+    # Resolves every ISBN in a file and logs the books found to the current reader
+    def import_isbn_file(self):
+        if self.isbn_import is not None:
+            self.isbn_resolver.cancel(self.isbn_import)
+            self.finish_isbn_import()
+            self.show_results_message(self.results_message.text().rstrip(".") + ", import cancelled")
+            return
 
-        self.books_read.append(book_entry)
-        self.save_book_to_csv(book_entry)
+        reader_name = getattr(self, "current_reader", None)
+        if reader_name is None:
+            self.show_results_message("Pick a reader on the Readers tab first")
+            return
 
-        # Refresh readers page
-        self.stack.removeWidget(self.readers_page_widget)
-        self.readers_page_widget = self.readers_page()
-        self.stack.insertWidget(0, self.readers_page_widget)
-        self.switch_to(0)
+        path, _ = QFileDialog.getOpenFileName(self, f"Import ISBNs for {reader_name}", "",
+                                              "Text files (*.txt *.csv);;All files (*)")
+        if not path:
+            return
+        from isbn_resolver import read_isbn_file
+        from result_ranker import normalize_isbn
+        try:
+            isbns = read_isbn_file(path)
+        except OSError as error:
+            self.show_results_message(f"Could not read {os.path.basename(path)}: {error}")
+            return
+        if not isbns:
+            self.show_results_message("No ISBNs found in that file")
+            return
 
+        # Each book is looked up once and logged once per reading in the file
+        readings = OrderedDict()
+        for isbn in isbns:
+            readings.setdefault(normalize_isbn(isbn), []).append(isbn)
+
+        self.setup_search()
+        progress = {"done": 0, "logged": 0, "failed": 0}
+
+        def book_resolved(isbn, doc, error):
+            count = len(readings[normalize_isbn(isbn)])
+            progress["done"] += count
+            if doc is not None:
+                book = self.docs_to_books([doc])[0]
+                for _ in range(count):
+                    self.log_book(reader_name, book)
+                progress["logged"] += count
+            elif error:
+                progress["failed"] += count
+            missing = progress["done"] - progress["logged"] - progress["failed"]
+            status = f"Logged {progress['logged']} of {len(isbns)} books for {reader_name}"
+            if progress["done"] < len(isbns):
+                status += "..."
+            if missing:
+                status += f", {missing} not found"
+            if progress["failed"]:
+                status += f", {progress['failed']} failed"
+            self.show_results_message(status)
+            if progress["done"] >= len(isbns):
+                self.finish_isbn_import()
+
+        self.show_results_message(f"Importing {len(isbns)} ISBNs for {reader_name}...")
+        self.isbn_import = book_resolved
+        self.import_button.setText("Cancel import")
+        self.isbn_resolver.resolve([spellings[0] for spellings in readings.values()], book_resolved)
+
+    def finish_isbn_import(self):
+        self.isbn_import = None
+        self.import_button.setText("Import ISBN list")
+
+    # Returns the reader's Book List, building it only on first visit
     def book_list_page(self, reader_name):
-        widget = QWidget()
-        layout = QVBoxLayout(widget)
-
-        scroll_area = QScrollArea()
-        scroll_area.setWidgetResizable(True)
-        content = QWidget()
-        grid = QGridLayout(content)
-
-        # Filter books for this reader
-        books = [b for b in self.books_read if b["reader"] == reader_name]
-
-        for i, book in enumerate(books):
-            # Thumbnail (placeholder for now)
-            thumb = QLabel()
-            thumb.setFixedSize(80, 120)
-            thumb.setStyleSheet("background-color: #d2d4d3; border-radius: 6px;")
-            thumb.setText(book["title"]) # replace with cover image later
-            thumb.setWordWrap(True)
-            
-            grid.addWidget(thumb,i // 4, i % 4) # 4 per row
-
-        content.setLayout(grid)
-        scroll_area.setWidget(content)
-        layout.addWidget(scroll_area)
-
-        return widget
+        from Book_List_Page import BookListPage
+
+        self.page(BOOK_LISTS_PAGE)
+        page = self.book_list_pages.get(reader_name)
+        if page is not None:
+            self.book_list_pages.move_to_end(reader_name)
+            return page
+
+        # Indexed lookup of this reader's books, including any still queued in the journal
+        with instruments.timer("book_list.load"):
+            self.journal.flush()
+            books = self.storage.books_for_reader(reader_name)
+        for book in books:
+            book["thumbnail"] = self.cover_url(book["cover_id"])
+
+        self.setup_covers()
+        with instruments.timer("book_list.build"):
+            page = BookListPage(reader_name, books, self.cover_downloader, self.cover_cache)
+        self.book_list_stack.addWidget(page)
+        self.book_list_pages[reader_name] = page
+
+        # Drop the least recently opened lists once the cache is full
+        while len(self.book_list_pages) > MAX_CACHED_BOOK_LISTS:
+            _, old_page = self.book_list_pages.popitem(last=False)
+            self.book_list_stack.removeWidget(old_page)
+            old_page.deleteLater()
+        return page
     
     def show_book_list(self, reader_name):
-        self.stack.addWidget(self.book_list_page(reader_name))
-        self.switch_to(self.stack.count() - 1)
+        page = self.book_list_page(reader_name)
+        self.book_list_stack.setCurrentWidget(page)
+        self.switch_to(BOOK_LISTS_PAGE, f"{reader_name}'s Books")
+
+    # Every reader's Book List shares one slot in the stack
+    def book_lists_page(self):
+        self.book_list_stack = QStackedWidget()
+        return self.book_list_stack
+
+    def save_book(self, book):
+        self.journal.add(book)
+
+    # Warns about logged books the journal could not write, each one only once
+    def report_unsaved_books(self):
+        unsaved = self.journal.failed[self.reported_failures:]
+        if not unsaved:
+            return
+        self.reported_failures += len(unsaved)
+        for book, error in unsaved:
+            print(f"Could not save {book.get('title')!r} for {book.get('reader')}: {error!r}", file=sys.stderr)
+        titles = ", ".join(book.get("title") or "Untitled" for book, _ in unsaved[:5])
+        if len(unsaved) > 5:
+            titles += f" and {len(unsaved) - 5} more"
+        QMessageBox.warning(self, "Books not saved",
+                            f"{len(unsaved)} logged book(s) could not be saved to books_read.db: {titles}\n\n"
+                            f"{unsaved[-1][1]!r}")
 
-    def save_book_to_csv(self,book):
-        with open("books_read.csv", "a", newline="") as file:
-            writer = csv.DictWriter(file, fieldnames=["title", "author", "isbn", "reader", "count"])
-            if file.tell() == 0:
-                writer.writeheader()
-            writer.writerow(book)
+    # Commits anything still queued before the window goes away
+    def closeEvent(self, event):
+        self.journal.close()
+        self.report_unsaved_books()
+        if instruments.enabled:
+            instruments.write_snapshot()
+        super().closeEvent(event)
 
 
 
@@ -518,56 +696,65 @@ class BookTracker(QMainWindow):
 
         # Header
         title = QLabel("Summary")
-        title.setStyleSheet("font-size: 22px; font-weight: bold;")
+        title.setObjectName("pageTitle")
         layout.addWidget(title)
 
         # Subscription Status
         subscribed_label = QLabel("✅ You're subscribed to daily reminders")
-        subscribed_label.setStyleSheet("font-size: 16px;")
+        subscribed_label.setObjectName("summaryText")
         layout.addWidget(subscribed_label)
 
         # Recipients
         recipients = os.getenv("RECIPIENT_PHONE_NUMBER",     "")
         recipients_label = QLabel(f"📱 Messages are being sent to: {recipients}")
-        recipients_label.setStyleSheet("font-size: 16px;")
+        recipients_label.setObjectName("summaryText")
         layout.addWidget(recipients_label)
 
-        # Reminder count
-        reminder_count = 23
+        # Reminder count and next send come from the reminder daemon's log
+        from reminder_log import ReminderLog
+        self.reminder_log = ReminderLog(os.getenv("REMINDER_LOG", "reminders.db"))
+        month_start = datetime.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        reminder_count = self.reminder_log.count_since(month_start.timestamp())
         count_label = QLabel(f"You've received {reminder_count} reminders this month")
-        count_label.setStyleSheet("font-size: 16px;")
+        count_label.setObjectName("summaryText")
         layout.addWidget(count_label)
 
         # Next reminder time
-        next_reminder_label = QLabel("⏰ Next reminder: Today at 8:00PM")
-        next_reminder_label.setStyleSheet("font-size: 16px;")
+        next_reminder_label = QLabel(f"⏰ Next reminder: {self.format_next_reminder(self.reminder_log.next_send())}")
+        next_reminder_label.setObjectName("summaryText")
         layout.addWidget(next_reminder_label)
 
         # Opt-out toggle
         opt_out_label = QLabel("🔕 SMS Notifications")
-        opt_out_label.setStyleSheet("font-size: 18px; font-weight: bold;")
+        opt_out_label.setObjectName("sectionTitle")
         layout.addWidget(opt_out_label)
 
         self.opt_out_toggle = QPushButton("Opt-Out")
         self.opt_out_toggle.setCheckable(True)
         self.opt_out_toggle.setCursor(Qt.PointingHandCursor)
-        self.opt_out_toggle.setStyleSheet("""
-            QPushButton{
-                background-color: #cf9851;
-                color: white;
-                padding: 8px;
-                border-radius: 16px;                            
-            }                                 
-            QPushButton:checked {
-                background-color: #999da1;
-            }
-        """)
-        self.opt_out_toggle.setChecked(False)
+        self.opt_out_toggle.setObjectName("optOutToggle")
+        numbers = [n.strip() for n in recipients.split(",") if n.strip()]
+        self.opt_out_toggle.setChecked(bool(numbers) and all(self.reminder_log.is_opted_out(n) for n in numbers))
+        self.opt_out_toggle.toggled.connect(lambda checked: self.set_sms_opt_out(numbers, checked))
         layout.addWidget(self.opt_out_toggle)
 
         scroll_area.setWidget(content_widget)
         return scroll_area
 
+    # The daemon checks opt-outs right before every send
+    def set_sms_opt_out(self, numbers, opted_out):
+        for number in numbers:
+            self.reminder_log.set_opt_out(number, opted_out)
+
+    # e.g. "Today at 8:00PM"
+    def format_next_reminder(self, due_at):
+        if due_at is None:
+            return "Not scheduled"
+        due = datetime.fromtimestamp(due_at)
+        days = (due.date() - date.today()).days
+        day = "Today" if days == 0 else "Tomorrow" if days == 1 else due.strftime("%b %d")
+        return f"{day} at {due.strftime('%I:%M%p').lstrip('0')}"
+
         
         # Notifications summary
         # You're subscribed to daily reminders
@@ -588,35 +775,37 @@ class BookTracker(QMainWindow):
         
         # Add content to the About page
         logo_path = "/Users/brettonpelagalli/Documents/VSC Projects/Python/images/logo.png"
-        pixmap = QPixmap(logo_path)
         logo_label = QLabel()
-        if not pixmap.isNull():
-            pixmap = pixmap.scaledToWidth(200, Qt.SmoothTransformation)
-            logo_label.setPixmap(pixmap)
-        else:
-            logo_label.setText("Logo not found")
         logo_label.setAlignment(Qt.AlignCenter)
+        def show_logo(pixmap):
+            if pixmap is not None:
+                logo_label.setPixmap(pixmap)
+            else:
+                logo_label.setText("Logo not found")
+        # Decoded and scaled to 200px wide on the image workers
+        shared_pipeline().render(("logo", logo_path), logo_path, 200, 1000, show_logo, logo_label)
         content_layout.addWidget(logo_label)
 
         title = QLabel("Program Overview")
         title.setAlignment(Qt.AlignLeft)
-        title.setStyleSheet("font-size: 18px; font-weight: bold;")
+        title.setObjectName("sectionTitle")
 
         paragraph = QLabel("The concept is simple, the rewards are priceless. Read a book (any book) to your newborn infant, and/or toddler. The goal is to have read 1,000 books (yes you can repeat books) before your little one starts kindergarten. Does it sound hard? Not really, if you think about it. If you read just one (1) book a night, you will have read about three hundred sixty-five (365) books in a year. That is seven hundred thirty (730) books in two years and one thousand ninety-five (1,095) books in three years. If you consider that most children start kindergarten at around five (5) years of age, you have more time than you think!")
         paragraph.setWordWrap(True)
         paragraph.setAlignment(Qt.AlignTop)
-        paragraph.setStyleSheet("font-size: 15px; line-height: 20px; padding-bottom: 20px")
+        paragraph.setObjectName("bodyText")
+        paragraph.setProperty("spaced", True)
 
         title_2 = QLabel("How To Participate")
         title_2.setAlignment(Qt.AlignLeft)
-        title_2.setStyleSheet("font-size: 18px; font-weight: bold;")
+        title_2.setObjectName("sectionTitle")
 
         paragraph_2 = QLabel("Read with your child. Studies have shown that reading with your child provides a great opportunity for bonding. Reading together is fun and will create life-long memories for the both of you.\n\n"
                              
         "Use this app to keep track of the titles of the books that you read with your child. If you are able to, make sure to keep a record of any book that is being read to your child.\n\n"
 
         "For additional information, visit: 1000BooksBeforeKindergarten.Org")
-        paragraph_2.setStyleSheet("font-size: 15px;")
+        paragraph_2.setObjectName("bodyText")
         paragraph_2.setWordWrap(True)
         paragraph_2.setAlignment(Qt.AlignTop)
        
@@ -0,0 +1,86 @@
+from PyQt5.QtCore import Qt, QSize, QRect
+from PyQt5.QtGui import QColor, QPainter
+from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QListView, QStyledItemDelegate, QAbstractItemView)
+from cover_list_model import CoverListModel, BookRole
+
+TILE_WIDTH = 80
+TILE_HEIGHT = 120
+TILE_SPACING = 10
+
+
+# Every book a reader has logged, covers sized for the grid tiles
+class BookListModel(CoverListModel):
+    cover_width = TILE_WIDTH
+    cover_height = TILE_HEIGHT
+
+
+# Paints one tile: the cover, or a grey placeholder with the title until it arrives
+class BookTileDelegate(QStyledItemDelegate):
+    def sizeHint(self, option, index):
+        return QSize(TILE_WIDTH, TILE_HEIGHT)
+
+    def paint(self, painter, option, index):
+        book = index.data(BookRole)
+        rect = QRect(option.rect.left(), option.rect.top(), TILE_WIDTH, TILE_HEIGHT)
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+
+        pixmap = index.data(Qt.DecorationRole)
+        if pixmap is not None:
+            ratio = pixmap.devicePixelRatio() # HiDPI covers have more pixels than logical size
+            x = rect.left() + (TILE_WIDTH - round(pixmap.width() / ratio)) // 2
+            y = rect.top() + (TILE_HEIGHT - round(pixmap.height() / ratio)) // 2
+            painter.drawPixmap(x, y, pixmap)
+        else:
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(QColor("#d2d4d3"))
+            painter.drawRoundedRect(rect, 6, 6)
+            painter.setPen(QColor("black"))
+            painter.drawText(rect.adjusted(4, 4, -4, -4), Qt.AlignCenter | Qt.TextWordWrap, book["title"])
+
+        painter.restore()
+
+
+# Grid of every book a reader has logged.
+# Built once per reader and kept up to date with add_book instead of being rebuilt.
+# Tiles are painted by a delegate, so only the visible ones cost anything.
+class BookListPage(QWidget):
+    def __init__(self, reader_name, books, downloader=None, cover_cache=None):
+        super().__init__()
+        self.reader_name = reader_name
+        self.model = BookListModel(downloader, cover_cache, parent=self)
+        self.initUI()
+        self.model.append_books(books)
+
+    @property
+    def count(self):
+        return self.model.rowCount()
+
+    def initUI(self):
+        layout = QVBoxLayout(self)
+
+        self.view = QListView()
+        self.view.setViewMode(QListView.IconMode)
+        self.view.setResizeMode(QListView.Adjust)
+        self.view.setMovement(QListView.Static)
+        self.view.setUniformItemSizes(True)
+        self.view.setGridSize(QSize(TILE_WIDTH + TILE_SPACING, TILE_HEIGHT + TILE_SPACING))
+        self.view.setSelectionMode(QAbstractItemView.NoSelection)
+        self.view.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.view.setItemDelegate(BookTileDelegate(self.view))
+        self.view.setModel(self.model)
+        self.view.verticalScrollBar().valueChanged.connect(self.update_cover_priorities)
+        layout.addWidget(self.view)
+
+    # Appends one tile to the end of the grid
+    def add_book(self, book):
+        self.model.append_books([book])
+
+    # Covers on screen download first
+    def update_cover_priorities(self):
+        grid = self.view.gridSize()
+        viewport = self.view.viewport()
+        columns = max(1, viewport.width() // grid.width())
+        first_line = self.view.verticalScrollBar().value() // grid.height()
+        visible_lines = viewport.height() // grid.height() + 1
+        self.model.prioritize_rows(first_line * columns, (first_line + visible_lines + 1) * columns - 1)
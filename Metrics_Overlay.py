@@ -0,0 +1,47 @@
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtWidgets import QLabel
+from instrumentation import instruments
+
+
+# Translucent debug panel over the main window with the live instrumentation snapshot.
+# Only refreshes while it is shown, toggle it with F12.
+class MetricsOverlay(QLabel):
+    def __init__(self, parent, interval_ms=1000):
+        super().__init__(parent)
+        self.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self.setAlignment(Qt.AlignTop | Qt.AlignLeft)
+        self.setObjectName("metricsOverlay") # Styled by theme.py
+        self.timer = QTimer(self)
+        self.timer.setInterval(interval_ms)
+        self.timer.timeout.connect(self.refresh)
+        self.hide()
+
+    def toggle(self):
+        self.setVisible(not self.isVisible())
+
+    def showEvent(self, event):
+        self.refresh()
+        self.timer.start()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self.timer.stop()
+        super().hideEvent(event)
+
+    def refresh(self):
+        snapshot = instruments.snapshot()
+        lines = []
+        for name, stats in sorted(snapshot.get("timers", {}).items()):
+            lines.append(f"{name}: p50 {stats['p50_ms']} ms  p95 {stats['p95_ms']} ms  n={stats['count']}")
+        for name, value in sorted(snapshot.get("gauges", {}).items()):
+            if isinstance(value, dict):
+                value = "  ".join(f"{key}={round(item, 2) if isinstance(item, float) else item}" for key, item in value.items())
+            lines.append(f"{name}: {value}")
+        for name, value in sorted(snapshot.get("counters", {}).items()):
+            lines.append(f"{name}: {value}")
+        for host, stats in sorted(snapshot.get("http", {}).items()):
+            lines.append(f"{host}: {stats['requests']} req  {stats['errors']} err  p95 {stats['p95_ms']} ms")
+        self.setText("\n".join(lines) or "No metrics yet")
+        self.adjustSize()
+        self.move(max(0, self.parent().width() - self.width() - 10), 10)
+        self.raise_()
@@ -0,0 +1,309 @@
+from PyQt5.QtCore import Qt, QSize, QRect, QEvent, QModelIndex, QAbstractListModel, QSortFilterProxyModel, pyqtSignal
+from PyQt5.QtGui import QColor, QFont, QPainter
+from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, QPushButton, QLabel, QListView,
+                             QStyledItemDelegate, QAbstractItemView, QMenu, QInputDialog, QMessageBox, QFileDialog)
+from image_pipeline import shared_pipeline
+from reader_roster import GOAL
+
+ReaderRole = Qt.UserRole + 1
+
+CARD_HEIGHT = 200
+AVATAR_SIZE = 64
+BAR_HEIGHT = 20
+BUTTON_HEIGHT = 28
+
+
+# The roster as a list model, one row per reader in name order.
+# Every change goes through here so rows, avatars and the roster stats stay in step.
+class ReaderListModel(QAbstractListModel):
+    stats_changed = pyqtSignal()
+    reader_renamed = pyqtSignal(str, str) # old name, new name
+    reader_removed = pyqtSignal(str)
+
+    def __init__(self, roster, parent=None):
+        super().__init__(parent)
+        self.roster = roster
+        self.avatars = {} # name -> QPixmap, or None when the reader has no usable photo
+        self.requesting = None # Name whose avatar is being asked for inside data()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.roster)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        name = self.roster.names[index.row()]
+        if role == Qt.DisplayRole:
+            return name
+        if role == ReaderRole:
+            return self.roster.get(name)
+        if role == Qt.DecorationRole:
+            return self.avatar_for(name)
+        return None
+
+    # Returns the reader's round photo if it is ready, otherwise starts rendering it
+    def avatar_for(self, name):
+        if name in self.avatars:
+            return self.avatars[name]
+        path = self.roster.image_path(name)
+        self.avatars[name] = None
+        if path:
+            self.requesting = name
+            shared_pipeline().avatar(path, AVATAR_SIZE, lambda pixmap, name=name: self.avatar_ready(name, pixmap), self)
+            self.requesting = None
+        return self.avatars[name]
+
+    def avatar_ready(self, name, pixmap):
+        if name not in self.roster:
+            return
+        self.avatars[name] = pixmap
+        if self.requesting != name: # Answered later, not from the pipeline's memory
+            self.reader_changed(name)
+
+    def reader_changed(self, name):
+        index = self.index(self.roster.row(name))
+        self.dataChanged.emit(index, index)
+
+    # Counts one logged book for the reader
+    def log_book(self, name):
+        if self.roster.log_book(name) is not None:
+            self.reader_changed(name)
+            self.stats_changed.emit()
+
+    def add_reader(self, name, start=0, image=None):
+        row = self.roster.add_reader(name, start, image)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.endInsertRows()
+        self.stats_changed.emit()
+
+    def remove_reader(self, name):
+        row = self.roster.row(name)
+        self.beginRemoveRows(QModelIndex(), row, row)
+        self.roster.remove_reader(name)
+        self.avatars.pop(name, None)
+        self.endRemoveRows()
+        self.stats_changed.emit()
+        self.reader_removed.emit(name)
+
+    def rename_reader(self, old_name, new_name):
+        self.beginResetModel()
+        try:
+            new_name = self.roster.rename_reader(old_name, new_name)
+        finally:
+            self.endResetModel()
+        avatar = self.avatars.pop(old_name, None)
+        if avatar is not None: # A photo still rendering is asked for again under the new name
+            self.avatars[new_name] = avatar
+        self.stats_changed.emit()
+        self.reader_renamed.emit(old_name, new_name)
+
+    def set_image(self, name, image):
+        self.roster.set_image(name, image)
+        self.avatars.pop(name, None)
+        self.reader_changed(name)
+
+
+# Filters readers by name, and optionally to those close to their next milestone
+class ReaderFilterModel(QSortFilterProxyModel):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setFilterCaseSensitivity(Qt.CaseInsensitive)
+        self.near_only = False
+
+    def set_near_only(self, near_only):
+        self.near_only = near_only
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if not super().filterAcceptsRow(source_row, source_parent):
+            return False
+        if self.near_only:
+            roster = self.sourceModel().roster
+            return roster.names[source_row] in roster.stats.near_milestone
+        return True
+
+
+# Paints one reader card: photo, name, progress and the two buttons
+class ReaderCardDelegate(QStyledItemDelegate):
+    add_clicked = pyqtSignal(str)
+    list_clicked = pyqtSignal(str)
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), CARD_HEIGHT)
+
+    def button_rects(self, rect):
+        top = rect.top() + 155
+        width = (rect.width() - 50) // 2
+        add = QRect(rect.left() + 20, top, width, BUTTON_HEIGHT)
+        book_list = QRect(add.right() + 10, top, width, BUTTON_HEIGHT)
+        return add, book_list
+
+    def paint(self, painter, option, index):
+        reader = index.data(ReaderRole)
+        rect = option.rect
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+
+        # Photo, or a grey circle with the first letter until it is ready
+        avatar_rect = QRect(rect.left() + 20, rect.top() + 10, AVATAR_SIZE, AVATAR_SIZE)
+        pixmap = index.data(Qt.DecorationRole)
+        if pixmap is not None:
+            painter.drawPixmap(avatar_rect.topLeft(), pixmap)
+        else:
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(QColor("#d2d4d3"))
+            painter.drawEllipse(avatar_rect)
+            initial_font = QFont(option.font)
+            initial_font.setPixelSize(26)
+            painter.setFont(initial_font)
+            painter.setPen(QColor("#487347"))
+            painter.drawText(avatar_rect, Qt.AlignCenter, reader["name"][:1].upper())
+
+        name_font = QFont(option.font)
+        name_font.setBold(True)
+        name_font.setPixelSize(18)
+        painter.setFont(name_font)
+        painter.setPen(QColor("black"))
+        painter.drawText(QRect(rect.left() + 20, rect.top() + 80, rect.width() - 40, 24),
+                         Qt.AlignLeft | Qt.AlignVCenter, reader["name"])
+
+        painter.setFont(option.font)
+        painter.drawText(QRect(rect.left() + 20, rect.top() + 104, rect.width() - 40, 20),
+                         Qt.AlignLeft | Qt.AlignVCenter, f"{reader['count']}/{GOAL} books read")
+
+        # Progress bar
+        bar = QRect(rect.left() + 20, rect.top() + 128, rect.width() - 40, BAR_HEIGHT)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QColor("#d2d4d3"))
+        painter.drawRoundedRect(bar, 10, 10)
+        filled = bar.width() * min(reader["count"], GOAL) // GOAL
+        if filled:
+            painter.setBrush(QColor("#487347"))
+            painter.drawRoundedRect(QRect(bar.left(), bar.top(), max(filled, BAR_HEIGHT), BAR_HEIGHT), 10, 10)
+
+        # Finished A Book and Book List buttons
+        add, book_list = self.button_rects(rect)
+        painter.setBrush(QColor("#487347"))
+        painter.drawRoundedRect(add, 14, 14)
+        painter.setBrush(QColor("white"))
+        painter.drawRoundedRect(book_list, 14, 14)
+        painter.setPen(QColor("white"))
+        painter.drawText(add, Qt.AlignCenter, "Finished A Book")
+        painter.setPen(QColor("#487347"))
+        painter.drawText(book_list, Qt.AlignCenter, "Book List")
+
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton:
+            add, book_list = self.button_rects(option.rect)
+            if add.contains(event.pos()):
+                self.add_clicked.emit(index.data(Qt.DisplayRole))
+                return True
+            if book_list.contains(event.pos()):
+                self.list_clicked.emit(index.data(Qt.DisplayRole))
+                return True
+        return super().editorEvent(event, model, option, index)
+
+
+# Readers page for anything from one family to a whole story-time group.
+# Cards are painted by a delegate in a virtualized list, so only visible readers cost anything,
+# and the roster can be searched, filtered to readers near a milestone, and edited in place.
+class ReadersPage(QWidget):
+    def __init__(self, model, add_callback, list_callback):
+        super().__init__()
+        self.model = model
+        self.proxy = ReaderFilterModel(self)
+        self.proxy.setSourceModel(model)
+        self.initUI()
+
+        self.delegate.add_clicked.connect(add_callback)
+        self.delegate.list_clicked.connect(list_callback)
+        model.stats_changed.connect(self.update_stats)
+        self.update_stats()
+
+    def initUI(self):
+        layout = QVBoxLayout(self)
+
+        controls = QHBoxLayout()
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("Search readers")
+        self.search_input.setClearButtonEnabled(True)
+        self.search_input.textChanged.connect(self.proxy.setFilterFixedString)
+        controls.addWidget(self.search_input, 1)
+
+        self.near_button = QPushButton("Near a milestone")
+        self.near_button.setCheckable(True)
+        self.near_button.setCursor(Qt.PointingHandCursor)
+        self.near_button.toggled.connect(self.proxy.set_near_only)
+        controls.addWidget(self.near_button)
+
+        add_button = QPushButton("+ Add Reader")
+        add_button.setCursor(Qt.PointingHandCursor)
+        add_button.clicked.connect(self.add_reader)
+        controls.addWidget(add_button)
+        layout.addLayout(controls)
+
+        self.stats_label = QLabel()
+        layout.addWidget(self.stats_label)
+
+        self.view = QListView()
+        self.view.setUniformItemSizes(True)
+        self.view.setSelectionMode(QAbstractItemView.NoSelection)
+        self.view.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.view.setFrameShape(QListView.NoFrame)
+        self.view.setContextMenuPolicy(Qt.CustomContextMenu)
+        self.view.customContextMenuRequested.connect(self.show_reader_menu)
+        self.delegate = ReaderCardDelegate(self.view)
+        self.view.setItemDelegate(self.delegate)
+        self.view.setModel(self.proxy)
+        layout.addWidget(self.view, 1)
+
+    def update_stats(self):
+        stats = self.model.roster.stats
+        self.stats_label.setText(
+            f"{stats.readers} readers · {stats.total_books} books read · "
+            f"{len(stats.near_milestone)} near a milestone · {len(stats.finished)} reached {GOAL}")
+        if self.proxy.near_only:
+            self.proxy.invalidateFilter()
+
+    def add_reader(self):
+        name, ok = QInputDialog.getText(self, "Add Reader", "Name:")
+        if not ok:
+            return
+        start, ok = QInputDialog.getInt(self, "Add Reader", "Books already read:", 0, 0, 100000)
+        if not ok:
+            return
+        try:
+            self.model.add_reader(name, start)
+        except ValueError as error:
+            QMessageBox.warning(self, "Add Reader", str(error))
+
+    # Right-click a card to rename, change the photo or remove the reader
+    def show_reader_menu(self, position):
+        index = self.view.indexAt(position)
+        if not index.isValid():
+            return
+        name = index.data(Qt.DisplayRole)
+        menu = QMenu(self)
+        rename = menu.addAction("Rename...")
+        photo = menu.addAction("Change Photo...")
+        remove = menu.addAction("Remove...")
+        chosen = menu.exec_(self.view.viewport().mapToGlobal(position))
+
+        if chosen == rename:
+            new_name, ok = QInputDialog.getText(self, "Rename Reader", "Name:", text=name)
+            if ok and new_name != name:
+                try:
+                    self.model.rename_reader(name, new_name)
+                except ValueError as error:
+                    QMessageBox.warning(self, "Rename Reader", str(error))
+        elif chosen == photo:
+            path, _ = QFileDialog.getOpenFileName(self, f"Photo for {name}", "", "Images (*.png *.jpg *.jpeg)")
+            if path:
+                self.model.set_image(name, path)
+        elif chosen == remove:
+            answer = QMessageBox.question(
+                self, "Remove Reader", f"Remove {name} from the roster? Their reading history is kept.")
+            if answer == QMessageBox.Yes:
+                self.model.remove_reader(name)
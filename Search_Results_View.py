@@ -0,0 +1,171 @@
+from PyQt5.QtCore import Qt, QSize, QRect, QEvent, QModelIndex, pyqtSignal
+from PyQt5.QtGui import QColor, QFont, QPainter, QFontMetrics
+from PyQt5.QtWidgets import QListView, QStyledItemDelegate, QStyle, QAbstractItemView
+from cover_list_model import CoverListModel, BookRole
+
+ROW_HEIGHT = 110
+COVER_WIDTH = 60
+COVER_HEIGHT = 90
+BUTTON_WIDTH = 64
+BUTTON_HEIGHT = 24
+
+
+# Holds the search results as plain book dicts, pages are appended as they arrive
+class SearchResultsModel(CoverListModel):
+    more_requested = pyqtSignal() # The view is near the bottom and another page exists
+
+    def __init__(self, downloader=None, cover_cache=None, parent=None):
+        super().__init__(downloader, cover_cache, parent)
+        self.query = ""
+        self.next_offset = 0
+        self.has_more = False
+        self.loading = False
+
+    # Empties the model for a new query
+    def reset(self, query):
+        self.beginResetModel()
+        self.books = []
+        self.query = query
+        self.next_offset = 0
+        self.has_more = False
+        self.loading = True
+        self.clear_covers()
+        self.endResetModel()
+
+    # Adds one page of books
+    def append_page(self, books, next_offset, has_more):
+        self.loading = False
+        self.next_offset = next_offset
+        self.has_more = has_more
+        self.append_books(books)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self.has_more and not self.loading
+
+    def fetchMore(self, parent=QModelIndex()):
+        if self.canFetchMore(parent):
+            self.loading = True
+            self.more_requested.emit()
+
+
+# Paints one result row: cover, title, author and the "+Read" button
+class BookResultDelegate(QStyledItemDelegate):
+    read_clicked = pyqtSignal(object) # book dict
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.times_read = None # book -> times the current reader has read it, looked up on every paint
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), ROW_HEIGHT)
+
+    def button_rect(self, rect):
+        return QRect(rect.right() - BUTTON_WIDTH - 10, rect.center().y() - BUTTON_HEIGHT // 2, BUTTON_WIDTH, BUTTON_HEIGHT)
+
+    def paint(self, painter, option, index):
+        book = index.data(BookRole)
+        rect = option.rect
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+
+        hovered = bool(option.state & QStyle.State_MouseOver)
+        if hovered:
+            painter.fillRect(rect, QColor("#f2f2f2"))
+
+        # Cover, or a grey tile until it arrives
+        cover_rect = QRect(rect.left() + 10, rect.top() + (ROW_HEIGHT - COVER_HEIGHT) // 2, COVER_WIDTH, COVER_HEIGHT)
+        pixmap = index.data(Qt.DecorationRole)
+        if pixmap is not None:
+            ratio = pixmap.devicePixelRatio() # HiDPI covers have more pixels than logical size
+            x = cover_rect.left() + (COVER_WIDTH - round(pixmap.width() / ratio)) // 2
+            y = cover_rect.top() + (COVER_HEIGHT - round(pixmap.height() / ratio)) // 2
+            painter.drawPixmap(x, y, pixmap)
+        else:
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(QColor("#d2d4d3"))
+            painter.drawRoundedRect(cover_rect, 6, 6)
+            if not book.get("cover_id"):
+                painter.setPen(QColor("black"))
+                painter.drawText(cover_rect, Qt.AlignCenter | Qt.TextWordWrap, "No Cover")
+
+        # Title and author
+        button = self.button_rect(rect)
+        text_left = cover_rect.right() + 10
+        text_width = min(200, button.left() - 10 - text_left)
+
+        title_font = QFont(option.font)
+        title_font.setBold(True)
+        title_font.setPixelSize(14)
+        title_rect = QRect(text_left, rect.top() + 15, text_width, 55)
+        painter.setFont(title_font)
+        painter.setPen(QColor("black"))
+        painter.drawText(title_rect, Qt.AlignLeft | Qt.AlignBottom | Qt.TextWordWrap, book["title"])
+
+        author_font = QFont(option.font)
+        author_font.setPixelSize(12)
+        painter.setFont(author_font)
+        painter.setPen(QColor("gray"))
+        author = QFontMetrics(author_font).elidedText(book["author"], Qt.ElideRight, text_width)
+        painter.drawText(QRect(text_left, title_rect.bottom() + 4, text_width, 20), Qt.AlignLeft | Qt.AlignTop, author)
+
+        # + Read button
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QColor(84, 120, 171, 230) if hovered else QColor("#5478ab"))
+        painter.drawRoundedRect(button, 10, 10)
+        painter.setPen(QColor("white"))
+        painter.setFont(option.font)
+        painter.drawText(button, Qt.AlignCenter, "+Read")
+
+        # Books already read are marked under the button
+        times = self.times_read(book) if self.times_read is not None else 0
+        if times:
+            painter.setFont(author_font)
+            painter.setPen(QColor("gray"))
+            painter.drawText(QRect(button.left() - 20, button.bottom() + 4, button.width() + 20, 18),
+                             Qt.AlignRight | Qt.AlignTop, f"Read {times}×")
+
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.MouseButtonRelease and self.button_rect(option.rect).contains(event.pos()):
+            self.read_clicked.emit(index.data(BookRole))
+            return True
+        return super().editorEvent(event, model, option, index)
+
+
+# List view for search results, only visible rows are ever painted
+class SearchResultsView(QListView):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setUniformItemSizes(True)
+        self.setMouseTracking(True)
+        self.setSelectionMode(QAbstractItemView.NoSelection)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.setFrameShape(QListView.NoFrame)
+        self.delegate = BookResultDelegate(self)
+        self.setItemDelegate(self.delegate)
+        self.verticalScrollBar().valueChanged.connect(self.on_scrolled)
+
+    def setModel(self, model):
+        super().setModel(model)
+        model.rowsInserted.connect(self.on_scrolled)
+        model.modelReset.connect(self.on_scrolled)
+
+    # Asks for the next page when the user nears the bottom, and re-ranks cover downloads
+    def on_scrolled(self, *args):
+        model = self.model()
+        if model is None:
+            return
+
+        first = self.indexAt(self.viewport().rect().topLeft()).row()
+        last = self.indexAt(self.viewport().rect().bottomLeft()).row()
+        if first >= 0:
+            model.prioritize_rows(first, last if last >= 0 else model.rowCount() - 1)
+
+        scroll_bar = self.verticalScrollBar()
+        if scroll_bar.maximum() - scroll_bar.value() <= ROW_HEIGHT * 3 and model.canFetchMore():
+            model.fetchMore()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.on_scrolled()
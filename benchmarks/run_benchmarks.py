@@ -0,0 +1,150 @@
+import os
+import sys
+import json
+import shutil
+import argparse
+import platform
+import tempfile
+import statistics
+import subprocess
+from datetime import datetime, timezone
+from stub_server import start_stub, stub_environment
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+REPO = os.path.dirname(HERE)
+RESULTS = os.path.join(HERE, "results")
+BOOK_LIST_SIZES = (10, 100, 1000)
+
+# Same default as the app's own FIRST_PAINT_BUDGET_MS
+FIRST_PAINT_BUDGET_MS = float(os.getenv("BOOKTRACKER_FIRST_PAINT_BUDGET_MS", "300"))
+
+# Metrics where a bigger number is better, everything else is a time or a size
+HIGHER_IS_BETTER = {"search.visible_covers", "memory.results"}
+
+
+# Every scenario run, as (scenario, extra arguments)
+def benchmark_runs(add_books, results):
+    runs = [
+        ("startup", []),
+        ("search", []),
+        ("memory", ["--results", str(results)]),
+        ("add_book", ["--books", str(add_books)])
+    ]
+    runs += [("book_list", ["--books", str(size)]) for size in BOOK_LIST_SIZES]
+    return runs
+
+
+# Runs one scenario in a fresh process and scratch directory, so every run starts cold
+def run_scenario(scenario, extra, env):
+    workdir = tempfile.mkdtemp(prefix="books-bench-")
+    try:
+        os.symlink(os.path.join(REPO, "icons"), os.path.join(workdir, "icons"))
+        completed = subprocess.run(
+            [sys.executable, os.path.join(HERE, "scenarios.py"), scenario] + extra,
+            cwd=workdir, env=env, capture_output=True, text=True, timeout=300)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    if completed.returncode != 0:
+        raise RuntimeError(f"{scenario} failed:\n{completed.stderr}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def summarize(values):
+    return {
+        "median": round(statistics.median(values), 3),
+        "min": min(values),
+        "max": max(values),
+        "runs": values
+    }
+
+
+# Compares two reports by median, returns (rows, regressions)
+def compare(previous, current, threshold):
+    rows = []
+    regressions = []
+    for name, stats in current["metrics"].items():
+        old = previous.get("metrics", {}).get(name)
+        if old is None or not old["median"]:
+            continue
+        change = (stats["median"] - old["median"]) / old["median"]
+        worse = -change if name in HIGHER_IS_BETTER else change
+        rows.append((name, old["median"], stats["median"], change))
+        if worse > threshold:
+            regressions.append(name)
+    return rows, regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless BookTracker benchmarks against a local OpenLibrary stub")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per scenario, the median is reported")
+    parser.add_argument("--latency-ms", type=float, default=50, help="stub latency per request")
+    parser.add_argument("--add-books", type=int, default=200, help="books logged in the add_book scenario")
+    parser.add_argument("--results", type=int, default=200, help="results paged in for the memory scenario")
+    parser.add_argument("--only", action="append", help="run just these scenarios")
+    parser.add_argument("--output", help="report path, default benchmarks/results/<timestamp>.json")
+    parser.add_argument("--compare", help="earlier report to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="relative slowdown counted as a regression")
+    parser.add_argument("--first-paint-budget-ms", type=float, default=FIRST_PAINT_BUDGET_MS,
+                        help="fail when the app's median time to first paint is over this")
+    args = parser.parse_args()
+
+    server = start_stub(latency_ms=args.latency_ms)
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen", LOCAL_CATALOG="", BOOKTRACKER_METRICS="0",
+               **stub_environment(server))
+
+    samples = {}
+    for scenario, extra in benchmark_runs(args.add_books, args.results):
+        if args.only and scenario not in args.only:
+            continue
+        for run in range(args.repeat):
+            print(f"{scenario} {' '.join(extra)} run {run + 1}/{args.repeat}", file=sys.stderr)
+            for name, value in run_scenario(scenario, extra, env).items():
+                samples.setdefault(name, []).append(value)
+    server.shutdown()
+
+    from PyQt5.QtCore import QT_VERSION_STR, PYQT_VERSION_STR
+    report = {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO,
+                                 capture_output=True, text=True).stdout.strip() or None,
+        "python": platform.python_version(),
+        "qt": QT_VERSION_STR,
+        "pyqt": PYQT_VERSION_STR,
+        "platform": platform.platform(),
+        "settings": {"repeat": args.repeat, "latency_ms": args.latency_ms,
+                     "add_books": args.add_books, "results": args.results,
+                     "first_paint_budget_ms": args.first_paint_budget_ms},
+        "metrics": {name: summarize(values) for name, values in samples.items()}
+    }
+
+    output = args.output or os.path.join(RESULTS, datetime.now().strftime("%Y%m%d-%H%M%S") + ".json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2)
+
+    for name, stats in report["metrics"].items():
+        print(f"{name:32} {stats['median']:>12}")
+    print(f"Report written to {output}")
+
+    failed = False
+    first_paint = report["metrics"].get("startup.window_first_paint_ms")
+    if first_paint and first_paint["median"] > args.first_paint_budget_ms:
+        print(f"First paint {first_paint['median']} ms is over the {args.first_paint_budget_ms} ms budget")
+        failed = True
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            rows, regressions = compare(json.load(file), report, args.threshold)
+        for name, old, new, change in rows:
+            print(f"{name:32} {old:>12} -> {new:>12} {change:+.1%}")
+        if regressions:
+            print(f"Regressions over {args.threshold:.0%}: {', '.join(regressions)}")
+            failed = True
+
+    if failed:
+        sys.exit(1)
+
+
+# python benchmarks/run_benchmarks.py --repeat 5 --compare benchmarks/results/baseline.json
+if __name__ == "__main__":
+    main()
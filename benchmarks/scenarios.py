@@ -0,0 +1,203 @@
+import time
+STARTED = time.perf_counter() # Before any imports, for cold startup
+
+import os
+import sys
+import json
+import argparse
+import importlib.util
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+READER = "Bellamy"
+SEARCH_QUERY = "benchmark"
+
+
+def rss_bytes():
+    try:
+        with open("/proc/self/statm") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def ms(seconds):
+    return round(seconds * 1000, 3)
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+# Loads 1000_Books_Tracker.py, which can't be imported by name
+def load_app_module():
+    sys.path.insert(0, REPO)
+    spec = importlib.util.spec_from_file_location("books_tracker", os.path.join(REPO, "1000_Books_Tracker.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# Runs the event loop until `predicate` is true
+def wait_until(app, predicate, timeout=60):
+    deadline = time.perf_counter() + timeout
+    while not predicate():
+        if time.perf_counter() > deadline:
+            raise TimeoutError("benchmark condition not reached")
+        app.processEvents()
+        time.sleep(0.0005)
+
+
+def paint(app, widget):
+    widget.repaint()
+    app.processEvents()
+
+
+def make_books(count):
+    return [{
+        "title": f"Logged Book {number}",
+        "author": f"Author {number % 37}",
+        "isbn": f"{9780000000000 + number}",
+        "cover_id": number + 1,
+        "reader": READER,
+        "date_read": "2024-01-01",
+        "count": 1
+    } for number in range(count)]
+
+
+def start_app(module, app):
+    window = module.BookTracker()
+    window.show()
+    paint(app, window)
+    return window
+
+
+# Import, construction and first paint of the main window in a fresh process
+def bench_startup(app, args):
+    imported = time.perf_counter()
+    module = load_app_module()
+    loaded = time.perf_counter()
+    window = module.BookTracker()
+    constructed = time.perf_counter()
+    window.show()
+    paint(app, window)
+    painted = time.perf_counter()
+    return {
+        "startup.window_first_paint_ms": round(window.first_paint_ms, 3), # As the app measures it
+        "startup.qt_import_ms": ms(imported - STARTED),
+        "startup.app_import_ms": ms(loaded - imported),
+        "startup.construct_ms": ms(constructed - loaded),
+        "startup.first_paint_ms": ms(painted - STARTED)
+    }
+
+
+# Search to first painted page, then until every visible cover is downloaded and decoded
+def bench_search(app, args):
+    window = start_app(load_app_module(), app)
+    window.switch_to(1)
+    paint(app, window)
+    model = window.results_model
+
+    started = time.perf_counter()
+    window.search_input.setText(SEARCH_QUERY)
+    window.perform_search()
+    wait_until(app, lambda: model.rowCount() > 0)
+    paint(app, window.results_view.viewport()) # Painting is what requests the covers
+    first_render = time.perf_counter()
+
+    def covers_done():
+        downloader = window.cover_downloader
+        return (not downloader.pending and not downloader.in_flight()
+                and not model.cover_jobs and not model.decoding)
+    wait_until(app, covers_done)
+    paint(app, window.results_view.viewport())
+    all_covers = time.perf_counter()
+
+    return {
+        "search.first_render_ms": ms(first_render - started),
+        "search.all_covers_ms": ms(all_covers - started),
+        "search.visible_covers": len(window.cover_cache.memory)
+    }
+
+
+# RSS growth per row while paging through `args.results` results
+def bench_memory(app, args):
+    window = start_app(load_app_module(), app)
+    window.switch_to(1)
+    paint(app, window)
+    model = window.results_model
+    before = rss_bytes()
+
+    window.search_input.setText(SEARCH_QUERY)
+    window.perform_search()
+    while model.rowCount() < args.results:
+        wait_until(app, lambda: model.rowCount() > 0 and not model.loading)
+        if not model.has_more:
+            break
+        if model.rowCount() < args.results:
+            window.load_more_results()
+    paint(app, window.results_view.viewport())
+    rows = model.rowCount()
+
+    return {
+        "memory.results": rows,
+        "memory.per_result_bytes": round((rss_bytes() - before) / max(1, rows))
+    }
+
+
+# Latency of logging one book, repeated `args.books` times
+def bench_add_book(app, args):
+    window = start_app(load_app_module(), app)
+    window.add_books(READER)
+    timings = []
+    for book in make_books(args.books):
+        started = time.perf_counter()
+        window.add_book_to_reader(book)
+        timings.append(time.perf_counter() - started)
+    window.journal.close()
+    return {
+        "add_book.mean_ms": ms(sum(timings) / len(timings)),
+        "add_book.p50_ms": ms(percentile(timings, 0.50)),
+        "add_book.p95_ms": ms(percentile(timings, 0.95))
+    }
+
+
+# Opening a reader's Book List for the first time with `args.books` books logged
+def bench_book_list(app, args):
+    sys.path.insert(0, REPO)
+    from book_storage import BookStorage
+    storage = BookStorage("books_read.db")
+    storage.add_readings(make_books(args.books))
+    storage.close()
+
+    window = start_app(load_app_module(), app)
+    started = time.perf_counter()
+    window.show_book_list(READER)
+    paint(app, window)
+    opened = time.perf_counter()
+    return {f"book_list.open_{args.books}_ms": ms(opened - started)}
+
+
+SCENARIOS = {
+    "startup": bench_startup,
+    "search": bench_search,
+    "memory": bench_memory,
+    "add_book": bench_add_book,
+    "book_list": bench_book_list
+}
+
+
+# Runs one scenario in this process and prints its metrics as one JSON line.
+# Meant to be started by run_benchmarks.py in a scratch directory with the stub's environment.
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("scenario", choices=SCENARIOS)
+    parser.add_argument("--books", type=int, default=100)
+    parser.add_argument("--results", type=int, default=200)
+    args = parser.parse_args()
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5.QtWidgets import QApplication
+    app = QApplication(sys.argv[:1])
+    print(json.dumps(SCENARIOS[args.scenario](app, args)))
@@ -0,0 +1,143 @@
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+SYNTHETIC_RESULTS = 1000
+
+
+# A cover-sized JPEG made with Qt so no binary fixtures are needed
+def make_cover_jpeg(width=180, height=270):
+    from PyQt5.QtCore import QBuffer, QByteArray, QIODevice
+    from PyQt5.QtGui import QImage, QColor, QPainter
+
+    image = QImage(width, height, QImage.Format_RGB32)
+    image.fill(QColor("#5478ab"))
+    painter = QPainter(image)
+    for row in range(0, height, 6):
+        painter.fillRect(0, row, width, 3, QColor(84 + row % 90, 120, 171))
+    painter.end()
+
+    data = QByteArray()
+    buffer = QBuffer(data)
+    buffer.open(QIODevice.WriteOnly)
+    image.save(buffer, "JPG", 85)
+    return bytes(data)
+
+
+# Deterministic OpenLibrary-shaped docs for any query without a recording
+def synthetic_docs(query, offset, limit, total=SYNTHETIC_RESULTS):
+    docs = []
+    for number in range(offset, min(offset + limit, total)):
+        docs.append({
+            "title": f"{query.title()} Book {number}",
+            "author_name": [f"Author {number % 37}"],
+            "isbn": [f"{9780000000000 + number}"],
+            "cover_i": number + 1
+        })
+    return docs
+
+
+# Stands in for the OpenLibrary search, Books API and covers endpoints.
+# Recorded search responses from fixtures/search.json are replayed by query, anything
+# else gets synthetic results. Every response waits `latency` seconds first.
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1" # Keep-alive, like the real endpoints
+    latency = 0.0
+    recordings = {}
+    cover = b""
+    requests = 0
+    lock = threading.Lock()
+
+    def log_message(self, format, *args):
+        pass
+
+    # Scenarios exit with downloads still running, that isn't an error here
+    def handle(self):
+        try:
+            super().handle()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def do_GET(self):
+        with StubHandler.lock:
+            StubHandler.requests += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+        url = urlsplit(self.path)
+        params = parse_qs(url.query)
+        if url.path == "/search.json":
+            query = " ".join(params.get("q", [""])[0].casefold().split())
+            limit = int(params.get("limit", ["20"])[0])
+            offset = int(params.get("offset", ["0"])[0])
+            recording = self.recordings.get(query)
+            if recording is not None:
+                docs = recording["docs"][offset:offset + limit]
+                found = recording["numFound"]
+            else:
+                docs = synthetic_docs(query, offset, limit)
+                found = SYNTHETIC_RESULTS
+            self.send_body(json.dumps({"numFound": found, "start": offset, "docs": docs}).encode(), "application/json")
+        elif url.path == "/api/books":
+            books = {}
+            for key in params.get("bibkeys", [""])[0].split(","):
+                if key.startswith("ISBN:"):
+                    books[key] = {"title": f"Book {key[5:]}", "authors": [{"name": "Stub Author"}],
+                                  "cover": {"medium": f"/b/id/{key[-6:].strip('X')}-M.jpg"}}
+            self.send_body(json.dumps(books).encode(), "application/json")
+        elif url.path.startswith("/b/id/"):
+            self.send_body(self.cover, "image/jpeg")
+        else:
+            self.send_error(404)
+
+    def send_body(self, body, content_type):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+# Starts the stub on a background thread, port 0 picks a free one
+def start_stub(port=0, latency_ms=0):
+    with open(os.path.join(FIXTURES, "search.json"), encoding="utf-8") as file:
+        StubHandler.recordings = json.load(file)
+    StubHandler.cover = make_cover_jpeg()
+    StubHandler.latency = latency_ms / 1000
+    server = ThreadingHTTPServer(("127.0.0.1", port), StubHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="StubServer", daemon=True).start()
+    return server
+
+
+# Environment pointing the app at a running stub
+def stub_environment(server):
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    return {
+        "OPEN_LIBRARY_SEARCH": f"{base}/search.json",
+        "OPEN_LIBRARY_COVER": f"{base}/b/id",
+        "OPEN_LIBRARY_BOOKS": f"{base}/api/books"
+    }
+
+
+# python benchmarks/stub_server.py --port 8765 --latency-ms 80
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local OpenLibrary stub for benchmarks")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    args = parser.parse_args()
+
+    server = start_stub(args.port, args.latency_ms)
+    for name, value in stub_environment(server).items():
+        print(f"{name}={value}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+        sys.exit(0)
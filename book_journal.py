@@ -0,0 +1,147 @@
+import time
+import queue
+import logging
+import sqlite3
+import threading
+from book_storage import BookStorage
+from instrumentation import instruments
+
+# "batch" fsyncs every committed batch, "exit" only syncs once when the journal closes
+DURABILITY_POLICIES = ("batch", "exit")
+# A batch the database refused while busy or locked is tried this many times
+WRITE_ATTEMPTS = 3
+RETRY_DELAY = 0.2 # Seconds, grows with each attempt
+FLUSH_TIMEOUT = 10.0 # Seconds flush() waits for the writer before giving up
+
+logger = logging.getLogger("booktracker.journal")
+
+
+# Write-behind journal for logged books.
+# The GUI thread only queues entries; a background thread commits them to SQLite in batches,
+# so a crash loses at most one flush interval of entries.
+# A batch that can't be written is retried, then saved one reading at a time so a single
+# bad entry never costs the rest. Readings that still fail are kept in `failed` and passed
+# to `on_failure(book, error)`, which runs on the writer thread.
+class BookJournal:
+    def __init__(self, db_path="books_read.db", flush_interval=1.0, durability="batch", max_batch=500,
+                 on_failure=None):
+        if durability not in DURABILITY_POLICIES:
+            raise ValueError(f"durability must be one of {DURABILITY_POLICIES}, got {durability!r}")
+        self.db_path = db_path
+        self.flush_interval = flush_interval
+        self.durability = durability
+        self.max_batch = max_batch
+        self.queue = queue.Queue()
+        self.thread = None
+        self.batches = 0
+        self.on_failure = on_failure
+        self.failed = [] # (book, error) for every reading that could not be saved
+        self.error = None # Last write error
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, name="BookJournal", daemon=True)
+            self.thread.start()
+
+    # Queues one reading, returns immediately
+    def add(self, book):
+        self.start()
+        self.queue.put(("book", book))
+
+    # Blocks until everything queued so far is committed.
+    # Returns False and logs why if the writer has died or doesn't get there within `timeout`.
+    def flush(self, timeout=FLUSH_TIMEOUT):
+        if self.thread is None:
+            return True
+        if not self.thread.is_alive():
+            logger.error("Journal writer has stopped (%r), %d readings are not saved", self.error, self.queue.qsize())
+            return False
+        done = threading.Event()
+        self.queue.put(("flush", done))
+        if not done.wait(timeout):
+            logger.error("Journal writer did not flush within %.0f s, %d readings still queued",
+                         timeout, self.queue.qsize())
+            return False
+        return True
+
+    # Commits what is left, syncs to disk and stops the writer
+    def close(self):
+        if self.thread is None:
+            return
+        self.queue.put(("stop", None))
+        self.thread.join()
+        self.thread = None
+
+    def _run(self):
+        try:
+            self._write()
+        except Exception as error:
+            self.error = error # Read by flush(), the thread ends here
+            raise
+
+    def _write(self):
+        synchronous = "FULL" if self.durability == "batch" else "OFF"
+        storage = BookStorage(self.db_path, synchronous=synchronous)
+        batch = []
+        waiters = []
+        stopping = False
+
+        while not stopping:
+            kind, item = self.queue.get()
+            deadline = time.monotonic() + self.flush_interval
+
+            # Group everything that arrives within one flush interval into a single commit
+            while True:
+                if kind == "book":
+                    batch.append(item)
+                elif kind == "flush":
+                    waiters.append(item)
+                    break
+                else:
+                    stopping = True
+                    break
+                if len(batch) >= self.max_batch:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    kind, item = self.queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+
+            if batch:
+                self._commit(storage, batch)
+                batch = []
+            for done in waiters:
+                done.set()
+            waiters = []
+
+        if self.durability == "exit":
+            storage.sync()
+        storage.close()
+
+    def _commit(self, storage, batch):
+        for attempt in range(WRITE_ATTEMPTS):
+            try:
+                with instruments.timer("journal.commit"):
+                    storage.add_readings(batch)
+                self.batches += 1
+                instruments.count("journal.books", len(batch))
+                return
+            except sqlite3.OperationalError: # Busy or locked, worth another go
+                time.sleep(RETRY_DELAY * (attempt + 1))
+            except Exception:
+                break
+
+        # The batch was rolled back, save what can be saved one reading at a time
+        for book in batch:
+            try:
+                storage.add_reading(book)
+                instruments.count("journal.books")
+            except Exception as error:
+                self.error = error
+                self.failed.append((book, error))
+                instruments.count("journal.failed")
+                if self.on_failure is not None:
+                    self.on_failure(book, error)
@@ -0,0 +1,175 @@
+import os
+import csv
+import sys
+import sqlite3
+from datetime import date
+
+# Columns written by the old books_read.csv, kept for exports
+CSV_FIELDS = ["title", "author", "isbn", "reader", "count"]
+
+
+# SQLite storage for every logged reading.
+# Indexed on reader, ISBN and date read so per-reader lists and counts stay fast
+# for households or classrooms with tens of thousands of entries.
+class BookStorage:
+    def __init__(self, path="books_read.db", synchronous="NORMAL"):
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute(f"PRAGMA synchronous={synchronous}")
+        self.create_tables()
+
+    def create_tables(self):
+        with self.db:
+            self.db.execute("""
+                CREATE TABLE IF NOT EXISTS readings (
+                    id INTEGER PRIMARY KEY,
+                    reader TEXT NOT NULL,
+                    title TEXT NOT NULL,
+                    author TEXT,
+                    isbn TEXT,
+                    cover_id INTEGER,
+                    date_read TEXT NOT NULL,
+                    count INTEGER NOT NULL DEFAULT 1
+                )
+            """)
+            self.db.execute("CREATE INDEX IF NOT EXISTS readings_reader ON readings(reader, date_read)")
+            self.db.execute("CREATE INDEX IF NOT EXISTS readings_isbn ON readings(isbn, reader)")
+            self.db.execute("CREATE INDEX IF NOT EXISTS readings_date ON readings(date_read)")
+            self.db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            self.db.execute("""
+                CREATE TABLE IF NOT EXISTS readers (
+                    id INTEGER PRIMARY KEY,
+                    name TEXT UNIQUE NOT NULL,
+                    start INTEGER NOT NULL DEFAULT 0,
+                    image TEXT
+                )
+            """)
+
+    def _row_values(self, book):
+        return (
+            book["reader"],
+            book.get("title") or "",
+            book.get("author") or "",
+            book.get("isbn") or None,
+            book.get("cover_id") or None,
+            book.get("date_read") or date.today().isoformat(),
+            int(book.get("count") or 1)
+        )
+
+    # Logs one reading and returns its row id
+    def add_reading(self, book):
+        with self.db:
+            cursor = self.db.execute(
+                "INSERT INTO readings (reader, title, author, isbn, cover_id, date_read, count) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                self._row_values(book))
+        return cursor.lastrowid
+
+    # Logs many readings in a single transaction
+    def add_readings(self, books):
+        with self.db:
+            self.db.executemany(
+                "INSERT INTO readings (reader, title, author, isbn, cover_id, date_read, count) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (self._row_values(book) for book in books))
+
+    def books_for_reader(self, reader):
+        rows = self.db.execute(
+            "SELECT title, author, isbn, cover_id, reader, date_read, count FROM readings WHERE reader = ? ORDER BY date_read, id",
+            (reader,))
+        return [dict(row) for row in rows]
+
+    # Streams readings in id order without loading them all into memory
+    def iter_readings(self, after_id=0):
+        cursor = self.db.execute(
+            "SELECT id, reader, isbn, title, author, date_read, count FROM readings WHERE id > ? ORDER BY id",
+            (after_id,))
+        cursor.row_factory = None # Plain tuples, no per-row Row objects
+        return cursor
+
+    def last_reading_id(self):
+        return self.db.execute("SELECT COALESCE(MAX(id), 0) FROM readings").fetchone()[0]
+
+    # How many times a book was read, optionally by one reader
+    def times_read(self, isbn, reader=None):
+        if reader is None:
+            row = self.db.execute("SELECT COALESCE(SUM(count), 0) FROM readings WHERE isbn = ?", (isbn,)).fetchone()
+        else:
+            row = self.db.execute(
+                "SELECT COALESCE(SUM(count), 0) FROM readings WHERE isbn = ? AND reader = ?", (isbn, reader)).fetchone()
+        return row[0]
+
+    # Imports an old books_read.csv once, later calls for the same file do nothing
+    def import_csv(self, csv_path):
+        if not os.path.exists(csv_path):
+            return 0
+        key = f"imported:{os.path.abspath(csv_path)}"
+        if self.db.execute("SELECT 1 FROM meta WHERE key = ?", (key,)).fetchone():
+            return 0
+
+        with open(csv_path, newline="") as file:
+            rows = [row for row in csv.DictReader(file) if row.get("reader")]
+
+        with self.db:
+            self.db.executemany(
+                "INSERT INTO readings (reader, title, author, isbn, cover_id, date_read, count) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (self._row_values(row) for row in rows))
+            self.db.execute("INSERT INTO meta (key, value) VALUES (?, ?)", (key, date.today().isoformat()))
+        return len(rows)
+
+    # Writes every reading back out using the original CSV columns
+    def export_csv(self, csv_path):
+        rows = self.db.execute(f"SELECT {', '.join(CSV_FIELDS)} FROM readings ORDER BY id")
+        with open(csv_path, "w", newline="") as file:
+            writer = csv.DictWriter(file, fieldnames=CSV_FIELDS)
+            writer.writeheader()
+            for row in rows:
+                writer.writerow(dict(row))
+
+    # The reader roster, e.g. [{"name": "Bellamy", "start": 247, "image": "images/bellamy.jpeg"}]
+    def readers(self):
+        rows = self.db.execute("SELECT name, start, image FROM readers ORDER BY id")
+        return [dict(row) for row in rows]
+
+    # Raises sqlite3.IntegrityError if the name is taken
+    def add_reader(self, name, start=0, image=None):
+        with self.db:
+            self.db.execute("INSERT INTO readers (name, start, image) VALUES (?, ?, ?)", (name, start, image))
+
+    # Takes the reader off the roster, their readings are kept
+    def remove_reader(self, name):
+        with self.db:
+            self.db.execute("DELETE FROM readers WHERE name = ?", (name,))
+
+    # Renames the reader and moves their readings over in one transaction
+    def rename_reader(self, old_name, new_name):
+        with self.db:
+            self.db.execute("UPDATE readers SET name = ? WHERE name = ?", (new_name, old_name))
+            self.db.execute("UPDATE readings SET reader = ? WHERE reader = ?", (new_name, old_name))
+
+    def set_reader_image(self, name, image):
+        with self.db:
+            self.db.execute("UPDATE readers SET image = ? WHERE name = ?", (image, name))
+
+    # Forces everything written so far onto disk
+    def sync(self):
+        self.db.execute("PRAGMA synchronous=FULL")
+        self.db.execute("PRAGMA wal_checkpoint(FULL)")
+
+    def close(self):
+        self.db.close()
+
+
+# python book_storage.py import books_read.csv | export books_export.csv
+if __name__ == "__main__":
+    if len(sys.argv) != 3 or sys.argv[1] not in ("import", "export"):
+        print("Usage: python book_storage.py import|export <file.csv>")
+        sys.exit(1)
+
+    storage = BookStorage()
+    if sys.argv[1] == "import":
+        print(f"Imported {storage.import_csv(sys.argv[2])} readings")
+    else:
+        storage.export_csv(sys.argv[2])
+        print(f"Exported readings to {sys.argv[2]}")
+    storage.close()
@@ -0,0 +1,135 @@
+import os
+import queue
+import threading
+from collections import OrderedDict
+from image_pipeline import shared_pipeline, device_pixel_ratio
+
+# Eviction frees space down to this share of the budget, so the next writes don't evict again
+EVICT_TO = 0.9
+
+
+# Cover thumbnails keyed by OpenLibrary cover_i, shared by every results list and Book List.
+# Scaled pixmaps are kept in an in-memory LRU and the raw JPEGs on disk under a byte budget.
+# Callers can ask for their own size, width/height are the default 60x90 result thumbnail.
+# Decoding and scaling happen on the image pipeline's workers, never on the GUI thread.
+# The folder is listed once, after that its sizes and use order are tracked in memory and
+# file writes, touches and deletes go to a background thread.
+class CoverCache:
+    def __init__(self, folder="cache/covers", max_memory_items=200,
+                 max_disk_bytes=50 * 1024 * 1024, width=60, height=90, pipeline=None):
+        self.folder = folder
+        self.max_memory_items = max_memory_items
+        self.max_disk_bytes = max_disk_bytes
+        self.width = width
+        self.height = height
+        self.pipeline = pipeline or shared_pipeline()
+        self.memory = OrderedDict() # (cover_id, width, height, device pixel ratio) -> scaled QPixmap
+        self.files = OrderedDict() # file name without .jpg -> size on disk, least recently used first
+        self.disk_bytes = 0
+        self.writing = {} # file name -> bytes queued for the disk thread but not written yet
+        self.disk_queue = queue.Queue()
+        self._scan()
+        threading.Thread(target=self._disk_worker, name="CoverCacheDisk", daemon=True).start()
+        # One hit or miss per cover a list asks for, repaints and downloads don't count
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def _path(self, cover_id):
+        return os.path.join(self.folder, f"{cover_id}.jpg")
+
+    def _key(self, cover_id, width, height):
+        return (cover_id, width or self.width, height or self.height, device_pixel_ratio())
+
+    # Returns a ready-to-show pixmap from memory, or None if it has to be loaded first.
+    # Pass count_hit for a list's first request of a cover, not for its repaints.
+    def get_pixmap(self, cover_id, width=None, height=None, count_hit=False):
+        key = self._key(cover_id, width, height)
+        pixmap = self.memory.get(key)
+        if pixmap is not None:
+            self.memory.move_to_end(key)
+            if count_hit:
+                self.hits += 1
+        return pixmap
+
+    # Decodes the cover from disk in the background, callback(pixmap or None) runs when it is ready.
+    # Returns False without calling back if the cover isn't on disk and has to be downloaded.
+    def load(self, cover_id, callback, owner=None, width=None, height=None):
+        name = str(cover_id)
+        if name not in self.files:
+            self.misses += 1
+            return False
+        self.files.move_to_end(name)
+        self.disk_queue.put(("touch", name, None)) # The use order survives a restart
+        self.hits += 1
+        self.disk_hits += 1
+        source = self.writing.get(name, self._path(name)) # Not on disk yet, use the bytes
+        self._render(cover_id, source, callback, owner, width, height)
+        return True
+
+    # Saves freshly downloaded bytes, callback gets the scaled pixmap (None if they don't decode)
+    def store(self, cover_id, data, callback, owner=None, width=None, height=None):
+        data = bytes(data)
+        self._write(cover_id, data)
+        self._render(cover_id, data, callback, owner, width, height)
+
+    def _render(self, cover_id, source, callback, owner, width, height):
+        key = self._key(cover_id, width, height)
+        def rendered(pixmap):
+            if pixmap is not None:
+                self._remember(key, pixmap)
+            callback(pixmap)
+        self.pipeline.render(("cover", cover_id), source, key[1], key[2], rendered, owner)
+
+    def _remember(self, key, pixmap):
+        self.memory[key] = pixmap
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.max_memory_items:
+            self.memory.popitem(last=False)
+
+    # Lists the folder once, oldest files first
+    def _scan(self):
+        try:
+            entries = [(entry.stat().st_mtime, entry.name[:-4], entry.stat().st_size)
+                       for entry in os.scandir(self.folder) if entry.is_file() and entry.name.endswith(".jpg")]
+        except OSError:
+            return # No folder yet
+        for _, name, size in sorted(entries):
+            self.files[name] = size
+            self.disk_bytes += size
+
+    def _write(self, cover_id, data):
+        name = str(cover_id) # Files are tracked by name, as the folder scan finds them
+        self.disk_bytes += len(data) - self.files.pop(name, 0)
+        self.files[name] = len(data)
+        self.writing[name] = data
+        self.disk_queue.put(("write", name, data))
+        if self.disk_bytes > self.max_disk_bytes:
+            self._evict()
+
+    # Forgets least recently used covers until the folder is well under budget
+    def _evict(self):
+        target = self.max_disk_bytes * EVICT_TO
+        while self.disk_bytes > target and len(self.files) > 1:
+            name, size = self.files.popitem(last=False)
+            self.disk_bytes -= size
+            self.disk_queue.put(("remove", name, None))
+
+    # Runs the queued file operations in order, off the GUI thread
+    def _disk_worker(self):
+        while True:
+            action, name, data = self.disk_queue.get()
+            path = self._path(name)
+            try:
+                if action == "write":
+                    os.makedirs(self.folder, exist_ok=True)
+                    with open(path, "wb") as file:
+                        file.write(data)
+                elif action == "touch":
+                    os.utime(path)
+                else:
+                    os.remove(path)
+            except OSError:
+                pass # Covers are still shown from memory if the disk is unavailable
+            if action == "write" and self.writing.get(name) is data:
+                self.writing.pop(name, None)
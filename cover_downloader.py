@@ -0,0 +1,101 @@
+import itertools
+from PyQt5.QtCore import QObject, QUrl
+from PyQt5.QtNetwork import QNetworkRequest
+
+
+# One queued or running download
+class DownloadJob:
+    def __init__(self, url, callback, owner_key, priority, order):
+        self.url = url
+        self.host = QUrl(url).host()
+        self.callback = callback
+        self.owner_key = owner_key
+        self.priority = priority
+        self.order = order
+        self.reply = None
+        self.cancelled = False
+
+
+# Central scheduler for cover downloads.
+# Caps how many requests run per host, starts the lowest priority number first
+# and aborts everything that belongs to a destroyed widget or an old search.
+class CoverDownloader(QObject):
+    def __init__(self, network_manager, max_per_host=4, timeout_ms=15000, parent=None):
+        super().__init__(parent)
+        self.network_manager = network_manager
+        self.max_per_host = max_per_host
+        self.timeout_ms = timeout_ms
+        self.pending = [] # Jobs waiting for a free slot
+        self.running = {} # host -> set of jobs in flight
+        self.counter = itertools.count()
+
+    # Queues a download, the callback receives the finished QNetworkReply
+    def request(self, url, callback, owner, priority=0):
+        owner_key = id(owner)
+        job = DownloadJob(url, callback, owner_key, priority, next(self.counter))
+        self.pending.append(job)
+
+        # Widgets deleted with deleteLater take their downloads with them
+        if isinstance(owner, QObject) and not getattr(owner, "_downloads_tracked", False):
+            owner._downloads_tracked = True
+            owner.destroyed.connect(lambda _=None, key=owner_key: self.cancel_owner_key(key))
+
+        self._dispatch()
+        return job
+
+    def set_job_priority(self, job, priority):
+        job.priority = priority
+
+    def in_flight(self):
+        return sum(len(jobs) for jobs in self.running.values())
+
+    def cancel_owner(self, owner):
+        self.cancel_owner_key(id(owner))
+
+    def cancel_owner_key(self, owner_key):
+        self._cancel(lambda job: job.owner_key == owner_key)
+
+    def _cancel(self, matches):
+        keep = []
+        for job in self.pending:
+            if matches(job):
+                job.cancelled = True
+            else:
+                keep.append(job)
+        self.pending = keep
+
+        for jobs in list(self.running.values()):
+            for job in list(jobs):
+                if matches(job):
+                    job.cancelled = True
+                    job.reply.abort() # finished fires and frees the slot
+
+        self._dispatch()
+
+    # Starts queued jobs while their host has free slots
+    def _dispatch(self):
+        if not self.pending:
+            return
+        self.pending.sort(key=lambda job: (job.priority, job.order))
+
+        waiting = []
+        for job in self.pending:
+            running = self.running.setdefault(job.host, set())
+            if len(running) >= self.max_per_host:
+                waiting.append(job)
+                continue
+
+            request = QNetworkRequest(QUrl(job.url))
+            request.setTransferTimeout(self.timeout_ms)
+            job.reply = self.network_manager.get(request)
+            job.reply.finished.connect(lambda job=job: self._handle_finished(job))
+            running.add(job)
+        self.pending = waiting
+
+    def _handle_finished(self, job):
+        self.running.get(job.host, set()).discard(job)
+        reply = job.reply
+        if not job.cancelled:
+            job.callback(reply)
+        reply.deleteLater()
+        self._dispatch()
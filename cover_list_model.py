@@ -0,0 +1,102 @@
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex
+
+BookRole = Qt.UserRole + 1
+
+
+# List model of plain book dicts whose covers load lazily.
+# A cover is only requested when its row is painted, so off-screen rows cost no downloads.
+class CoverListModel(QAbstractListModel):
+    cover_width = 60
+    cover_height = 90
+
+    def __init__(self, downloader=None, cover_cache=None, parent=None):
+        super().__init__(parent)
+        self.downloader = downloader
+        self.cover_cache = cover_cache
+        self.books = []
+        self.clear_covers()
+
+    def clear_covers(self):
+        self.cover_rows = {} # cover_id -> rows showing it
+        self.cover_jobs = {} # cover_id -> queued/running download
+        self.decoding = set() # cover_ids being decoded off the GUI thread
+        self.missing_covers = set() # cover_ids that failed to download
+        self.requested_covers = set() # cover_ids already looked up in the cache, for its hit rate
+
+    # Appends books at the end of the list
+    def append_books(self, books):
+        if not books:
+            return
+        first = len(self.books)
+        self.beginInsertRows(QModelIndex(), first, first + len(books) - 1)
+        for row, book in enumerate(books, first):
+            self.books.append(book)
+            if book.get("cover_id"):
+                self.cover_rows.setdefault(book["cover_id"], []).append(row)
+        self.endInsertRows()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.books)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        book = self.books[index.row()]
+        if role == Qt.DisplayRole:
+            return book["title"]
+        if role == BookRole:
+            return book
+        if role == Qt.DecorationRole:
+            return self.cover_for(book)
+        return None
+
+    # Returns the cover pixmap if it is ready, otherwise starts a download for it
+    def cover_for(self, book):
+        cover_id = book.get("cover_id")
+        if not cover_id or self.cover_cache is None or cover_id in self.missing_covers:
+            return None
+        if cover_id in self.cover_jobs or cover_id in self.decoding:
+            return None # Still downloading or decoding
+
+        first_request = cover_id not in self.requested_covers
+        self.requested_covers.add(cover_id)
+        pixmap = self.cover_cache.get_pixmap(cover_id, self.cover_width, self.cover_height, count_hit=first_request)
+        if pixmap is not None:
+            return pixmap
+
+        # Covers on disk are decoded in the background, the rest are downloaded first
+        ready = lambda pixmap, cover_id=cover_id: self.cover_ready(cover_id, pixmap)
+        if self.cover_cache.load(cover_id, ready, self, self.cover_width, self.cover_height):
+            self.decoding.add(cover_id)
+        elif self.downloader is not None and book.get("thumbnail"):
+            self.cover_jobs[cover_id] = self.downloader.request(
+                book["thumbnail"], lambda reply, cover_id=cover_id: self.handle_cover_reply(cover_id, reply), self)
+        return None
+
+    def handle_cover_reply(self, cover_id, reply):
+        self.cover_jobs.pop(cover_id, None)
+        if reply.error() != reply.NoError:
+            self.cover_ready(cover_id, None)
+            return
+        self.decoding.add(cover_id)
+        self.cover_cache.store(cover_id, reply.readAll(), lambda pixmap: self.cover_ready(cover_id, pixmap),
+                               self, self.cover_width, self.cover_height)
+
+    # Repaints the rows showing a cover once it is decoded, or marks it missing
+    def cover_ready(self, cover_id, pixmap):
+        self.decoding.discard(cover_id)
+        if pixmap is None:
+            self.missing_covers.add(cover_id)
+
+        for row in self.cover_rows.get(cover_id, []):
+            index = self.index(row)
+            self.dataChanged.emit(index, index, [Qt.DecorationRole])
+
+    # Visible rows' covers jump the queue, the rest wait by distance from the viewport
+    def prioritize_rows(self, first, last):
+        if self.downloader is None:
+            return
+        for cover_id, job in self.cover_jobs.items():
+            rows = self.cover_rows.get(cover_id, [])
+            distance = min((0 if first <= row <= last else min(abs(row - first), abs(row - last))) for row in rows) if rows else 0
+            self.downloader.set_job_priority(job, distance)
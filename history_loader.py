@@ -0,0 +1,205 @@
+import os
+import sys
+import json
+from array import array
+from base64 import b64encode, b64decode
+from datetime import date
+from functools import lru_cache
+from result_ranker import normalize_isbn
+
+SNAPSHOT_PATH = "cache/history_snapshot.json"
+
+
+# Every logged reading held compactly in memory, rebuilt from the saved history.
+# Each book is stored once as a (key, title, author) record with an integer id, and a
+# reading is one slot across four arrays (reader id, book id, day, count) at a fixed
+# 16 bytes. Totals per reader and per reader and book are kept as readings
+# arrive, so "times read" is a dict lookup however long the history gets.
+class HistoryIndex:
+    VERSION = 4 # Snapshot layout and key scheme, older snapshots are rebuilt
+
+    def __init__(self):
+        self.reader_names = [] # reader id -> name
+        self.reader_ids = {} # name -> reader id
+        self.books = [] # book id -> (book key, title, author)
+        self.book_ids = {} # book key -> book id
+        self.entry_readers = array("I")
+        self.entry_books = array("I")
+        self.entry_days = array("I") # date.toordinal() of the reading, 0 when unknown
+        self.entry_counts = array("I")
+        self.reader_counts = {} # reader -> books read
+        self.pair_counts = {} # reader id << 32 | book id -> times read
+        self.last_id = 0 # Highest reading id already counted
+
+    def __len__(self):
+        return len(self.entry_books)
+
+    def _reader_id(self, reader):
+        reader_id = self.reader_ids.get(reader)
+        if reader_id is None:
+            reader_id = self.reader_ids[reader] = len(self.reader_names)
+            self.reader_names.append(reader)
+        return reader_id
+
+    # The book's id, its first title and author are kept for every later reading
+    def _book_id(self, book_key, title=None, author=None):
+        book_id = self.book_ids.get(book_key)
+        if book_id is None:
+            book_id = self.book_ids[book_key] = len(self.books)
+            self.books.append((book_key, title or None, sys.intern(author) if author else None))
+        return book_id
+
+    # Counts one reading
+    def apply(self, reader, book_key, count=1, row_id=None, title=None, author=None, date_read=None):
+        reader_id = self.reader_ids.get(reader)
+        if reader_id is None:
+            reader_id = self._reader_id(reader)
+        book_id = self.book_ids.get(book_key)
+        if book_id is None:
+            book_id = self._book_id(book_key, title, author)
+        self.entry_readers.append(reader_id)
+        self.entry_books.append(book_id)
+        self.entry_days.append(day_number(date_read))
+        self.entry_counts.append(count)
+
+        self.reader_counts[reader] = self.reader_counts.get(reader, 0) + count
+        pair = reader_id << 32 | book_id
+        self.pair_counts[pair] = self.pair_counts.get(pair, 0) + count
+        if row_id is not None and row_id > self.last_id:
+            self.last_id = row_id
+
+    # Moves a reader's readings and totals over to their new name
+    def rename_reader(self, old_name, new_name):
+        old_id = self.reader_ids.pop(old_name, None)
+        if old_id is None:
+            return
+        if new_name not in self.reader_ids:
+            self.reader_names[old_id] = new_name
+            self.reader_ids[new_name] = old_id
+            self.reader_counts[new_name] = self.reader_counts.pop(old_name, 0)
+            return
+
+        # Merging into an existing name, repoint the old slots and fold the counters in
+        new_id = self.reader_ids[new_name]
+        for slot, reader_id in enumerate(self.entry_readers):
+            if reader_id == old_id:
+                self.entry_readers[slot] = new_id
+        for pair in [pair for pair in self.pair_counts if pair >> 32 == old_id]:
+            merged = new_id << 32 | pair & 0xFFFFFFFF
+            self.pair_counts[merged] = self.pair_counts.get(merged, 0) + self.pair_counts.pop(pair)
+        self.reader_counts[new_name] = self.reader_counts.get(new_name, 0) + self.reader_counts.pop(old_name, 0)
+
+    # Times one reader read a book
+    def times_read(self, reader, book_key):
+        reader_id = self.reader_ids.get(reader)
+        book_id = self.book_ids.get(book_key)
+        if reader_id is None or book_id is None:
+            return 0
+        return self.pair_counts.get(reader_id << 32 | book_id, 0)
+
+
+    def to_dict(self):
+        return {
+            "version": self.VERSION,
+            "last_id": self.last_id,
+            "reader_names": self.reader_names,
+            "reader_counts": self.reader_counts,
+            "books": self.books,
+            "arrays": {name: b64encode(getattr(self, name).tobytes()).decode("ascii") for name in ENTRY_FIELDS},
+            "pair_counts": [[pair, count] for pair, count in self.pair_counts.items()]
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        if data.get("version") != cls.VERSION:
+            raise ValueError("history snapshot is from another version")
+        index = cls()
+        index.last_id = data["last_id"]
+        index.reader_names = data["reader_names"]
+        index.reader_ids = {name: reader_id for reader_id, name in enumerate(index.reader_names)}
+        index.reader_counts = data["reader_counts"]
+        index.books = [(key, title, sys.intern(author) if author else None) for key, title, author in data["books"]]
+        index.book_ids = {book[0]: book_id for book_id, book in enumerate(index.books)}
+        for name in ENTRY_FIELDS:
+            values = array("I")
+            values.frombytes(b64decode(data["arrays"][name]))
+            setattr(index, name, values)
+        index.pair_counts = {pair: count for pair, count in data["pair_counts"]}
+        slots = {len(getattr(index, name)) for name in ENTRY_FIELDS}
+        if len(slots) > 1:
+            raise ValueError("history snapshot arrays don't line up")
+        return index
+
+
+ENTRY_FIELDS = ("entry_readers", "entry_books", "entry_days", "entry_counts")
+
+
+# "2024-01-31" as a day number, 0 for a missing or unreadable date.
+# Histories repeat the same few hundred dates, so parsed ones are remembered.
+@lru_cache(maxsize=4096)
+def day_number(date_read):
+    if not date_read:
+        return 0
+    try:
+        return date.fromisoformat(date_read).toordinal()
+    except (TypeError, ValueError):
+        return 0
+
+
+# Books are indexed by ISBN when there is one, otherwise by title.
+# ISBN-10 and ISBN-13 spellings of a book share its ISBN-13, so repeat counts never split.
+# The same books come up again and again in a history, so keys are remembered.
+@lru_cache(maxsize=8192)
+def book_key(isbn, title):
+    if isbn:
+        return normalize_isbn(isbn) or isbn
+    return f"title:{(title or '').casefold()}"
+
+
+def load_snapshot(path):
+    try:
+        with open(path) as file:
+            return HistoryIndex.from_dict(json.load(file))
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def save_snapshot(index, path):
+    folder = os.path.dirname(path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    # Write then rename so a crash never leaves half a snapshot behind
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w") as file:
+        json.dump(index.to_dict(), file, separators=(",", ":"))
+    os.replace(temp_path, path)
+
+
+# Forgets a snapshot that no longer matches the saved readings, the next load rebuilds it
+def discard_snapshot(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+# Rebuilds the history index in one streaming pass over the storage.
+# With a snapshot only readings added after it are replayed, so startup stays flat as history grows.
+def load_history(storage, snapshot_path=SNAPSHOT_PATH, write_snapshot=True):
+    index = load_snapshot(snapshot_path) if snapshot_path else None
+
+    # The database was replaced or rolled back, start over
+    if index is None or index.last_id > storage.last_reading_id():
+        index = HistoryIndex()
+
+    replayed = 0
+    for row_id, reader, isbn, title, author, date_read, count in storage.iter_readings(after_id=index.last_id):
+        index.apply(reader, book_key(isbn, title), count, row_id, title, author, date_read)
+        replayed += 1
+
+    if write_snapshot and snapshot_path and replayed:
+        try:
+            save_snapshot(index, snapshot_path)
+        except OSError:
+            pass # Next launch just replays a little more
+    return index
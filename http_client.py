@@ -0,0 +1,101 @@
+import os
+import time
+import threading
+from collections import deque
+from urllib.parse import urlsplit
+
+# Shared HTTP settings, used by the requests pool here and by the Qt network manager
+POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "4"))
+TIMEOUT_SECONDS = float(os.getenv("HTTP_TIMEOUT_SECONDS", "10"))
+
+
+# Nearest-rank percentile of sorted latencies in seconds, as milliseconds
+def percentile_ms(latencies, fraction):
+    if not latencies:
+        return None
+    return round(latencies[min(len(latencies) - 1, int(len(latencies) * fraction))] * 1000, 1)
+
+
+# Request counts, errors and latencies per host
+class HttpMetrics:
+    def __init__(self, window=200):
+        self.window = window
+        self.hosts = {} # host -> {"requests", "errors", "latencies"}
+        self.lock = threading.Lock()
+
+    def record(self, url, seconds, ok=True):
+        host = urlsplit(url).netloc
+        with self.lock:
+            stats = self.hosts.setdefault(host, {"requests": 0, "errors": 0, "latencies": deque(maxlen=self.window)})
+            stats["requests"] += 1
+            stats["latencies"].append(seconds)
+            if not ok:
+                stats["errors"] += 1
+
+    # Plain dict of per-host totals and latency percentiles in milliseconds
+    def snapshot(self):
+        with self.lock:
+            result = {}
+            for host, stats in self.hosts.items():
+                latencies = sorted(stats["latencies"])
+                result[host] = {
+                    "requests": stats["requests"],
+                    "errors": stats["errors"],
+                    "p50_ms": percentile_ms(latencies, 0.50),
+                    "p95_ms": percentile_ms(latencies, 0.95)
+                }
+            return result
+
+
+metrics = HttpMetrics()
+
+
+# Keep-alive connection pools per host on top of one requests.Session.
+# Every request gets the shared default timeout and is timed into `metrics`.
+class HttpClient:
+    def __init__(self, pool_size=POOL_SIZE, timeout=TIMEOUT_SECONDS, metrics=metrics):
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.timeout = timeout
+        self.metrics = metrics
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        # Time every request made through the session, including ones made by the Twilio client
+        send = self.session.send
+        def timed_send(request, **kwargs):
+            started = time.perf_counter()
+            try:
+                response = send(request, **kwargs)
+            except Exception:
+                self.metrics.record(request.url, time.perf_counter() - started, ok=False)
+                raise
+            self.metrics.record(request.url, time.perf_counter() - started, ok=response.status_code < 400)
+            return response
+        self.session.send = timed_send
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        return self.session.request(method, url, **kwargs)
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+
+_shared_client = None
+_shared_lock = threading.Lock()
+
+
+# The one pooled client for the whole process, created on first use
+def shared_client():
+    global _shared_client
+    with _shared_lock:
+        if _shared_client is None:
+            _shared_client = HttpClient()
+        return _shared_client
@@ -0,0 +1,160 @@
+import os
+import threading
+from collections import OrderedDict
+from PyQt5.QtCore import Qt, QObject, QRunnable, QThreadPool, QBuffer, QByteArray, QIODevice, pyqtSignal
+from PyQt5.QtGui import QImage, QImageReader, QPainter, QPainterPath, QPixmap, QGuiApplication
+from instrumentation import instruments
+
+
+def device_pixel_ratio():
+    app = QGuiApplication.instance()
+    return app.devicePixelRatio() if app is not None else 1.0
+
+
+# Decodes a file path or encoded bytes straight to width x height device pixels.
+# JPEGs are scaled while decoding, so a large photo never exists at full size in memory.
+# Safe to call from any thread, it only touches QImage.
+def render_image(source, width, height, mode=Qt.KeepAspectRatio, rounded=False):
+    if isinstance(source, (bytes, bytearray)):
+        buffer = QBuffer()
+        buffer.setData(QByteArray(bytes(source)))
+        buffer.open(QIODevice.ReadOnly)
+        reader = QImageReader(buffer)
+    else:
+        reader = QImageReader(source)
+    reader.setAutoTransform(True)
+
+    size = reader.size()
+    if size.isValid():
+        reader.setScaledSize(size.scaled(width, height, mode))
+    image = reader.read()
+    if image.isNull():
+        return None
+    if not size.isValid():
+        image = image.scaled(width, height, mode, Qt.SmoothTransformation)
+
+    if rounded:
+        image = round_image(image, width, height)
+    return image
+
+
+# Centers the image in a width x height circle, transparent outside it
+def round_image(image, width, height):
+    result = QImage(width, height, QImage.Format_ARGB32_Premultiplied)
+    result.fill(Qt.transparent)
+    painter = QPainter(result)
+    painter.setRenderHint(QPainter.Antialiasing)
+    path = QPainterPath()
+    path.addEllipse(0, 0, width, height)
+    painter.setClipPath(path)
+    painter.drawImage((width - image.width()) // 2, (height - image.height()) // 2, image)
+    painter.end()
+    return result
+
+
+class RenderTask(QRunnable):
+    def __init__(self, pipeline, key, source, width, height, mode, rounded):
+        super().__init__()
+        self.pipeline = pipeline
+        self.key = key
+        self.source = source
+        self.width = width
+        self.height = height
+        self.mode = mode
+        self.rounded = rounded
+
+    def run(self):
+        with instruments.timer("image.decode"):
+            image = render_image(self.source, self.width, self.height, self.mode, self.rounded)
+        try:
+            self.pipeline.decoded.emit(self.key, image) # Queued to the GUI thread
+        except RuntimeError: # The app quit while this was decoding
+            pass
+
+
+# Decodes and scales images on a worker pool so the GUI thread only wraps finished
+# QImages in pixmaps. Requests for the same key share one decode, callbacks whose
+# owner has been destroyed are dropped, and rendered avatars are kept in an LRU
+# keyed by path, mtime and size so page rebuilds never decode them again.
+class ImagePipeline(QObject):
+    decoded = pyqtSignal(object, object) # key, QImage or None
+
+    def __init__(self, max_threads=2, max_memory_items=64, parent=None):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_threads)
+        self.max_memory_items = max_memory_items
+        self.memory = OrderedDict() # key -> rendered avatar QPixmap
+        self.waiting = {} # key -> [(owner_key, callback, remember)]
+        self.decoded.connect(self._handle_decoded)
+
+    # Renders `source` at width x height logical pixels, callback(pixmap or None) runs on the GUI thread
+    def render(self, key, source, width, height, callback, owner=None,
+               mode=Qt.KeepAspectRatio, rounded=False, remember=False):
+        ratio = device_pixel_ratio()
+        owner_key = self._track(owner)
+        key = (key, width, height, ratio)
+        callbacks = self.waiting.get(key)
+        if callbacks is not None:
+            callbacks.append((owner_key, callback, remember))
+            return
+        self.waiting[key] = [(owner_key, callback, remember)]
+        self.pool.start(RenderTask(self, key, source, round(width * ratio), round(height * ratio), mode, rounded))
+
+    # A round profile picture, answered from memory when the file hasn't changed
+    def avatar(self, path, size, callback, owner=None):
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            callback(None)
+            return
+
+        key = (("avatar", path, mtime), size, size, device_pixel_ratio())
+        pixmap = self.memory.get(key)
+        if pixmap is not None:
+            self.memory.move_to_end(key)
+            callback(pixmap)
+            return
+        self.render(key[0], path, size, size, callback, owner,
+                    Qt.KeepAspectRatioByExpanding, rounded=True, remember=True)
+
+    def _track(self, owner):
+        if not isinstance(owner, QObject):
+            return None
+        owner_key = id(owner)
+        if not getattr(owner, "_images_tracked", False):
+            owner._images_tracked = True
+            owner.destroyed.connect(lambda _=None, key=owner_key: self.cancel_owner_key(key))
+        return owner_key
+
+    # The decode still finishes, its result just isn't handed to a destroyed owner
+    def cancel_owner_key(self, owner_key):
+        for key, callbacks in self.waiting.items():
+            self.waiting[key] = [entry for entry in callbacks if entry[0] != owner_key]
+
+    def _handle_decoded(self, key, image):
+        callbacks = self.waiting.pop(key, [])
+        pixmap = None
+        if image is not None:
+            pixmap = QPixmap.fromImage(image)
+            pixmap.setDevicePixelRatio(key[3])
+        if pixmap is not None and any(remember for _, _, remember in callbacks):
+            self.memory[key] = pixmap
+            self.memory.move_to_end(key)
+            while len(self.memory) > self.max_memory_items:
+                self.memory.popitem(last=False)
+        for _, callback, _ in callbacks:
+            callback(pixmap)
+
+
+_shared_pipeline = None
+_shared_lock = threading.Lock()
+
+
+# The one image pipeline for the whole app, created on first use
+def shared_pipeline():
+    global _shared_pipeline
+    with _shared_lock:
+        if _shared_pipeline is None:
+            _shared_pipeline = ImagePipeline()
+        return _shared_pipeline
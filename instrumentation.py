@@ -0,0 +1,126 @@
+import os
+import json
+import time
+import logging
+import threading
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from logging.handlers import RotatingFileHandler
+from http_client import metrics as http_metrics, percentile_ms
+
+# BOOKTRACKER_METRICS=1 turns instrumentation on, otherwise every call is a no-op
+ENABLED = os.getenv("BOOKTRACKER_METRICS", "0") == "1"
+LOG_PATH = os.getenv("BOOKTRACKER_METRICS_LOG", "cache/metrics.jsonl")
+LOG_MAX_BYTES = int(os.getenv("BOOKTRACKER_METRICS_LOG_BYTES", str(5 * 1024 * 1024)))
+LOG_BACKUPS = 3
+
+
+# Timers, counters and gauges around the app's hot paths.
+# Timers keep a window of recent durations for percentiles, counters only go up,
+# and gauges are callables read when a snapshot is taken (covers in flight, cache hit rates).
+# Safe to use from the journal and image worker threads.
+class Instrumentation:
+    enabled = True
+
+    def __init__(self, log_path=LOG_PATH, window=500):
+        self.log_path = log_path
+        self.window = window
+        self.timers = {} # name -> deque of seconds
+        self.counters = {}
+        self.gauges = {} # name -> callable
+        self.lock = threading.Lock()
+        self.logger = None
+        self.started = time.time()
+
+    @contextmanager
+    def timer(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def record(self, name, seconds):
+        with self.lock:
+            durations = self.timers.get(name)
+            if durations is None:
+                durations = self.timers[name] = deque(maxlen=self.window)
+            durations.append(seconds)
+
+    def count(self, name, amount=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def gauge(self, name, read):
+        with self.lock:
+            self.gauges[name] = read
+
+    def snapshot(self):
+        with self.lock:
+            timers = {name: sorted(durations) for name, durations in self.timers.items()}
+            counters = dict(self.counters)
+            gauges = dict(self.gauges)
+
+        result = {
+            "time": round(time.time(), 3),
+            "uptime_s": round(time.time() - self.started, 1),
+            "timers": {},
+            "counters": counters,
+            "gauges": {},
+            "http": http_metrics.snapshot()
+        }
+        for name, durations in timers.items():
+            result["timers"][name] = {
+                "count": len(durations),
+                "p50_ms": percentile_ms(durations, 0.50),
+                "p95_ms": percentile_ms(durations, 0.95),
+                "max_ms": percentile_ms(durations, 1.0)
+            }
+        for name, read in gauges.items():
+            try:
+                result["gauges"][name] = read()
+            except Exception as error: # A gauge whose owner has gone away
+                result["gauges"][name] = repr(error)
+        return result
+
+    # Appends a snapshot as one JSON line, rotating the log once it is full
+    def write_snapshot(self):
+        snapshot = self.snapshot()
+        if self.logger is None:
+            folder = os.path.dirname(self.log_path)
+            if folder:
+                os.makedirs(folder, exist_ok=True)
+            self.logger = logging.getLogger("booktracker.metrics")
+            self.logger.propagate = False
+            self.logger.setLevel(logging.INFO)
+            handler = RotatingFileHandler(self.log_path, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUPS)
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            self.logger.addHandler(handler)
+        self.logger.info(json.dumps(snapshot))
+        return snapshot
+
+
+# Stand-in used when instrumentation is off, nothing is timed, stored or written
+class NullInstrumentation:
+    enabled = False
+
+    def timer(self, name):
+        return nullcontext()
+
+    def record(self, name, seconds):
+        pass
+
+    def count(self, name, amount=1):
+        pass
+
+    def gauge(self, name, read):
+        pass
+
+    def snapshot(self):
+        return {}
+
+    def write_snapshot(self):
+        return {}
+
+
+instruments = Instrumentation() if ENABLED else NullInstrumentation()
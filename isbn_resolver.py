@@ -0,0 +1,149 @@
+import re
+import json
+from collections import deque
+from PyQt5.QtCore import QObject, QUrl, QUrlQuery
+from PyQt5.QtNetwork import QNetworkRequest, QNetworkReply
+from result_ranker import normalize_isbn
+
+ISBN_TEXT = re.compile(r"^[\s-]*(?:\d[\s-]*){9}[\dXx][\s-]*(?:(?:\d[\s-]*){3})?$")
+ISBN_TOKEN = re.compile(r"[0-9Xx][0-9Xx-]{8,16}[0-9Xx]")
+COVER_ID = re.compile(r"/b/id/(\d+)-")
+
+
+# The bare ISBN-10 or ISBN-13 typed into `text`, or None if it is anything else.
+# Hyphenated ISBNs have four parts (ISBN-10) or five (ISBN-13), so "701-570-5206" is a
+# phone number, and the check digit has to match.
+def parse_isbn(text):
+    if not ISBN_TEXT.match(text or ""):
+        return None
+    parts = [part for part in re.split(r"[\s-]+", text.strip()) if part]
+    isbn = "".join(parts).upper()
+    if len(parts) > 1 and len(parts) != (4 if len(isbn) == 10 else 5):
+        return None
+    return isbn if normalize_isbn(isbn) else None
+
+
+# Every ISBN in a file such as a library checkout export or a barcode scanner dump, in file
+# order. A book listed on several lines was read several times and is returned once per line,
+# its ISBN-10 and ISBN-13 on the same line count once.
+def read_isbn_file(path):
+    isbns = []
+    with open(path, encoding="utf-8", errors="replace") as file:
+        for line in file:
+            line_isbns = {}
+            for token in ISBN_TOKEN.findall(line):
+                isbn = parse_isbn(token)
+                if isbn:
+                    line_isbns.setdefault(normalize_isbn(isbn), isbn)
+            isbns.extend(line_isbns.values())
+    return isbns
+
+
+# One OpenLibrary Books API record as a search doc (title, author_name, isbn, cover_i)
+def book_to_doc(isbn, book):
+    identifiers = book.get("identifiers", {})
+    doc = {
+        "title": book.get("title", "Unknown Title"),
+        "author_name": [author["name"] for author in book.get("authors", []) if author.get("name")],
+        "isbn": list(dict.fromkeys([isbn] + identifiers.get("isbn_13", []) + identifiers.get("isbn_10", [])))
+    }
+    for url in book.get("cover", {}).values():
+        match = COVER_ID.search(url)
+        if match:
+            doc["cover_i"] = int(match.group(1))
+            break
+    return doc
+
+
+# Resolves ISBNs with OpenLibrary's Books API instead of a full-text search.
+# Lookups are answered from the cache when possible, the rest are sent in batches of
+# bibkeys with at most max_in_flight requests running, so a file of hundreds of ISBNs
+# goes out as a handful of concurrent requests. Books OpenLibrary doesn't know are cached too.
+class IsbnResolver(QObject):
+    def __init__(self, books_url, network_manager, cache=None, max_in_flight=4,
+                 batch_size=20, timeout_ms=10000, parent=None):
+        super().__init__(parent)
+        self.books_url = books_url
+        self.network_manager = network_manager
+        self.cache = cache
+        self.max_in_flight = max_in_flight
+        self.batch_size = batch_size
+        self.timeout_ms = timeout_ms
+        self.pending = deque() # (isbn, callback) waiting for a free request slot
+        self.running = {} # Reply in flight -> its batch
+        self.cancelled = set() # Callbacks whose lookups are still in flight but must not be called
+
+    # Looks up each ISBN, callback(isbn, doc, error) runs once per ISBN with doc None if not found
+    def resolve(self, isbns, callback):
+        for isbn in isbns:
+            if self.cache is not None:
+                docs = self.cache.get(normalize_isbn(isbn), 1)
+                if docs is not None:
+                    callback(isbn, docs[0] if docs else None, None)
+                    continue
+            self.pending.append((isbn, callback))
+        self._dispatch()
+
+    def in_flight(self):
+        return len(self.running)
+
+    # Drops the lookups made with `callback` without calling it. Requests that only serve
+    # them are aborted, ones shared with other lookups finish for those.
+    def cancel(self, callback):
+        self.pending = deque(entry for entry in self.pending if entry[1] is not callback)
+        self.cancelled.add(callback)
+        for reply, batch in list(self.running.items()):
+            if all(entry_callback is callback for _, entry_callback in batch):
+                reply.abort()
+
+    def _dispatch(self):
+        while self.pending and len(self.running) < self.max_in_flight:
+            batch = [self.pending.popleft() for _ in range(min(self.batch_size, len(self.pending)))]
+
+            url = QUrl(self.books_url)
+            params = QUrlQuery()
+            params.addQueryItem("bibkeys", ",".join(f"ISBN:{isbn}" for isbn, _ in batch))
+            params.addQueryItem("format", "json")
+            params.addQueryItem("jscmd", "data")
+            url.setQuery(params)
+
+            request = QNetworkRequest(url)
+            request.setTransferTimeout(self.timeout_ms)
+            reply = self.network_manager.get(request)
+            reply.finished.connect(lambda reply=reply, batch=batch: self.handle_reply(reply, batch))
+            self.running[reply] = batch
+
+    def handle_reply(self, reply, batch):
+        self.running.pop(reply, None)
+        reply.deleteLater()
+        batch = [entry for entry in batch if entry[1] not in self.cancelled]
+        if not self.running:
+            self.cancelled.clear() # Nothing left that could call them
+        if not batch:
+            self._dispatch()
+            return
+
+        error = None
+        books = {}
+        if reply.error() != QNetworkReply.NoError:
+            error = reply.errorString()
+        else:
+            try:
+                books = json.loads(bytes(reply.readAll()))
+            except ValueError:
+                error = "Invalid response from OpenLibrary"
+
+        self._dispatch() # Keep the next batch moving before running callbacks
+        if error:
+            for isbn, callback in batch:
+                callback(isbn, None, error)
+            return
+
+        docs = []
+        for isbn, _ in batch:
+            book = books.get(f"ISBN:{isbn}")
+            docs.append(book_to_doc(isbn, book) if book else None)
+        if self.cache is not None: # The whole reply in one write
+            self.cache.put_many([(normalize_isbn(isbn), [doc] if doc else []) for (isbn, _), doc in zip(batch, docs)], 1)
+        for (isbn, callback), doc in zip(batch, docs):
+            callback(isbn, doc, None)
@@ -0,0 +1,238 @@
+import os
+import re
+import sys
+import gzip
+import json
+import sqlite3
+from result_ranker import normalize_isbn
+
+RECORD_TYPES = ("/type/work", "/type/edition")
+
+
+def open_dump(path):
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8")
+    return open(path, encoding="utf-8")
+
+
+# ISBNs as indexed: valid ones as their ISBN-13, so either form of a book finds it
+def index_isbns(isbns):
+    return " ".join(dict.fromkeys(normalize_isbn(isbn) or isbn.replace("-", "").upper() for isbn in isbns))
+
+
+# Builds an FTS5 MATCH expression: every word must appear, the last one may be a prefix
+def fts_query(query):
+    digits = re.sub(r"[\s-]", "", query)
+    if re.fullmatch(r"\d{9}[\dXx]|\d{13}", digits):
+        return f'isbn:"{normalize_isbn(digits) or digits.upper()}"'
+    words = re.findall(r"\w+", query.casefold())
+    if not words:
+        return None
+    return " ".join(f'"{word}"' for word in words[:-1]) + f' "{words[-1]}"*'
+
+
+# Offline book catalog built from an OpenLibrary dump.
+# Works go into a compact SQLite table with an FTS5 index over title, author and ISBN, and
+# search() returns docs shaped like the OpenLibrary search API (title, author_name, isbn,
+# cover_i) so perform_search can use them unchanged. Editions are folded into their work:
+# they add its ISBNs (works carry none) and fill in a missing cover or author, so a
+# popular book is one result however many printings it has.
+class LocalCatalog:
+    def __init__(self, path="catalog.db"):
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.create_tables()
+
+    def create_tables(self):
+        with self.db:
+            self.db.execute("CREATE TABLE IF NOT EXISTS authors (key TEXT PRIMARY KEY, name TEXT NOT NULL)")
+            self.db.execute("""
+                CREATE TABLE IF NOT EXISTS books (
+                    id INTEGER PRIMARY KEY,
+                    key TEXT UNIQUE NOT NULL,
+                    title TEXT NOT NULL,
+                    author_name TEXT NOT NULL,
+                    isbn TEXT NOT NULL,
+                    cover_i INTEGER
+                )
+            """)
+            self.db.execute("CREATE TABLE IF NOT EXISTS editions (key TEXT PRIMARY KEY)") # Already folded in
+            self.db.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS books_fts USING fts5(
+                    title, author_name, isbn,
+                    content='books', content_rowid='id',
+                    tokenize='unicode61 remove_diacritics 2'
+                )
+            """)
+
+    def is_empty(self):
+        return self.db.execute("SELECT 1 FROM books LIMIT 1").fetchone() is None
+
+    # Streams a dump (plain or .gz) in fixed-size batches so memory stays flat for multi-GB files.
+    # Import the authors dump first so works and editions can resolve author names.
+    # Works and editions can come in either order, ISBN search needs the editions dump.
+    def import_dump(self, path, batch_size=5000, progress=None):
+        authors = []
+        books = []
+        imported = 0
+
+        with open_dump(path) as file:
+            for line in file:
+                record_type, _, rest = line.partition("\t")
+                if record_type == "/type/author":
+                    record = json.loads(rest.rsplit("\t", 1)[-1])
+                    if record.get("name"):
+                        authors.append((record["key"], record["name"]))
+                elif record_type in RECORD_TYPES:
+                    books.append(json.loads(rest.rsplit("\t", 1)[-1]))
+                else:
+                    continue
+
+                if len(authors) >= batch_size:
+                    self._insert_authors(authors)
+                    authors = []
+                if len(books) >= batch_size:
+                    self._insert_authors(authors) # Names must be in before books resolve them
+                    authors = []
+                    imported += self._insert_books(books)
+                    books = []
+                    if progress:
+                        progress(imported)
+
+        self._insert_authors(authors)
+        imported += self._insert_books(books)
+
+        # Rebuilding the external-content index is done inside SQLite, page by page
+        with self.db:
+            self.db.execute("INSERT INTO books_fts(books_fts) VALUES ('rebuild')")
+        return imported
+
+    def _insert_authors(self, authors):
+        if authors:
+            with self.db:
+                self.db.executemany("INSERT OR REPLACE INTO authors (key, name) VALUES (?, ?)", authors)
+
+    def _insert_books(self, records):
+        if not records:
+            return 0
+
+        # Resolve just this batch's author keys
+        author_keys = list({key for record in records for key in self._author_keys(record)})
+        names = {}
+        for start in range(0, len(author_keys), 500):
+            chunk = author_keys[start:start + 500]
+            rows = self.db.execute(
+                f"SELECT key, name FROM authors WHERE key IN ({','.join('?' * len(chunk))})", chunk)
+            names.update(rows)
+
+        # Editions already folded in by an earlier import would add their ISBNs twice
+        edition_keys = list({record["key"] for record in records if not record["key"].startswith("/works/")})
+        seen = set()
+        for start in range(0, len(edition_keys), 500):
+            chunk = edition_keys[start:start + 500]
+            seen.update(key for key, in self.db.execute(
+                f"SELECT key FROM editions WHERE key IN ({','.join('?' * len(chunk))})", chunk))
+
+        works = []
+        editions = []
+        for record in records:
+            if not record.get("title") or record["key"] in seen:
+                continue
+            author_names = [names[key] for key in self._author_keys(record) if key in names]
+            isbns = record.get("isbn_13", []) + record.get("isbn_10", [])
+            covers = [cover for cover in record.get("covers", []) if cover and cover > 0]
+            row = [
+                record["key"],
+                record["title"],
+                json.dumps(author_names),
+                index_isbns(isbns),
+                covers[0] if covers else None
+            ]
+            if record["key"].startswith("/works/"):
+                works.append(row)
+                continue
+            seen.add(record["key"])
+            work_keys = [work["key"] for work in record.get("works", []) if work.get("key")]
+            if work_keys:
+                row[0] = work_keys[0] # Filed under its work, an edition without one stands alone
+            editions.append(row)
+
+        # Whichever of a work and its editions comes first creates the row, the work's
+        # title and authors win, editions add ISBNs and fill gaps
+        with self.db:
+            self.db.executemany("""
+                INSERT INTO books (key, title, author_name, isbn, cover_i) VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET
+                    title = excluded.title,
+                    author_name = CASE WHEN excluded.author_name != '[]' THEN excluded.author_name ELSE books.author_name END,
+                    cover_i = COALESCE(excluded.cover_i, books.cover_i)
+            """, works)
+            self.db.executemany("""
+                INSERT INTO books (key, title, author_name, isbn, cover_i) VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET
+                    isbn = trim(books.isbn || ' ' || excluded.isbn),
+                    author_name = CASE WHEN books.author_name = '[]' THEN excluded.author_name ELSE books.author_name END,
+                    cover_i = COALESCE(books.cover_i, excluded.cover_i)
+            """, editions)
+            self.db.executemany("INSERT OR IGNORE INTO editions (key) VALUES (?)", [(row_key,) for row_key in seen])
+        return len(works) + len(editions)
+
+    # Works list authors as {"author": {"key": ...}}, editions as {"key": ...}
+    def _author_keys(self, record):
+        keys = []
+        for author in record.get("authors", []):
+            author = author.get("author", author)
+            if isinstance(author, dict) and author.get("key"):
+                keys.append(author["key"])
+        return keys
+
+    # Full-text search, best matches first with title weighted above author above ISBN
+    def search(self, query, limit=20, offset=0):
+        match = fts_query(query)
+        if match is None:
+            return []
+        try:
+            rows = self.db.execute("""
+                SELECT books.title, books.author_name, books.isbn, books.cover_i
+                FROM books_fts JOIN books ON books.id = books_fts.rowid
+                WHERE books_fts MATCH ?
+                ORDER BY bm25(books_fts, 10.0, 5.0, 1.0)
+                LIMIT ? OFFSET ?
+            """, (match, limit, offset)).fetchall()
+        except sqlite3.OperationalError:
+            return []
+
+        docs = []
+        for title, author_name, isbn, cover_i in rows:
+            doc = {"title": title, "author_name": json.loads(author_name), "isbn": isbn.split()}
+            if cover_i:
+                doc["cover_i"] = cover_i
+            docs.append(doc)
+        return docs
+
+    def close(self):
+        self.db.close()
+
+
+# Opens the catalog only if one has been built
+def open_local_catalog(path):
+    if path and os.path.exists(path):
+        catalog = LocalCatalog(path)
+        if not catalog.is_empty():
+            return catalog
+        catalog.close()
+    return None
+
+
+# python local_catalog.py ol_dump_authors.txt.gz ol_dump_works.txt.gz ol_dump_editions.txt.gz
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python local_catalog.py <dump file> [<dump file> ...]")
+        sys.exit(1)
+
+    catalog = LocalCatalog(os.getenv("LOCAL_CATALOG", "catalog.db"))
+    for dump_path in sys.argv[1:]:
+        print(f"Importing {dump_path}")
+        count = catalog.import_dump(dump_path, progress=lambda n: print(f"  {n} books", end="\r"))
+        print(f"  {count} books imported")
+    catalog.close()
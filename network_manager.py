@@ -0,0 +1,26 @@
+import time
+from PyQt5.QtNetwork import QNetworkAccessManager, QNetworkReply
+from http_client import metrics, TIMEOUT_SECONDS
+
+
+# The app's single QNetworkAccessManager for searches and covers.
+# Qt keeps connections alive and pooled per host; this adds the shared default timeout
+# and records every request into the same metrics as the requests-based client.
+class PooledNetworkManager(QNetworkAccessManager):
+    def __init__(self, parent=None, timeout=TIMEOUT_SECONDS):
+        super().__init__(parent)
+        self.setTransferTimeout(int(timeout * 1000))
+        self.metrics = metrics
+
+    def createRequest(self, operation, request, data=None):
+        reply = super().createRequest(operation, request, data)
+        url = request.url().toString()
+        started = time.perf_counter()
+        reply.finished.connect(lambda: self.record(reply, url, started))
+        return reply
+
+    def record(self, reply, url, started):
+        # Aborted requests say nothing about the server, leave them out
+        if reply.error() == QNetworkReply.OperationCanceledError:
+            return
+        self.metrics.record(url, time.perf_counter() - started, ok=reply.error() == QNetworkReply.NoError)
@@ -0,0 +1,168 @@
+import os
+import sqlite3
+from history_loader import discard_snapshot, SNAPSHOT_PATH
+
+GOAL = 1000
+MILESTONE_STEP = 100 # Every hundred books is a milestone
+NEAR_MILESTONE = 10 # Books to go that count as "near"
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# First-launch roster, image paths are relative to the app folder
+DEFAULT_READERS = [
+    {"name": "Bellamy", "start": 247, "image": "images/bellamy.jpeg"},
+    {"name": "Marceline", "start": 500, "image": "images/marceline.jpeg"}
+]
+
+
+def near_milestone(count):
+    return count < GOAL and MILESTONE_STEP - count % MILESTONE_STEP <= NEAR_MILESTONE
+
+
+# Totals across the roster, kept up to date one change at a time instead of recomputed
+class RosterStats:
+    def __init__(self):
+        self.readers = 0
+        self.total_books = 0
+        self.near_milestone = set() # Names of readers within NEAR_MILESTONE of their next milestone
+        self.finished = set() # Names of readers at or past GOAL
+
+    def add(self, name, count):
+        self.readers += 1
+        self.total_books += count
+        self._place(name, count)
+
+    def remove(self, name, count):
+        self.readers -= 1
+        self.total_books -= count
+        self.near_milestone.discard(name)
+        self.finished.discard(name)
+
+    def change(self, name, old_count, new_count):
+        self.total_books += new_count - old_count
+        self._place(name, new_count)
+
+    def rename(self, old_name, new_name):
+        for names in (self.near_milestone, self.finished):
+            if old_name in names:
+                names.discard(old_name)
+                names.add(new_name)
+
+    def _place(self, name, count):
+        if near_milestone(count):
+            self.near_milestone.add(name)
+        else:
+            self.near_milestone.discard(name)
+        if count >= GOAL:
+            self.finished.add(name)
+        else:
+            self.finished.discard(name)
+
+
+# Every reader the app tracks, saved in the readers table of the books database.
+# Counts are the reader's starting books plus their logged history, and the stats are
+# adjusted on every logged book, add, remove and rename.
+# Names are kept in case-insensitive order for the Readers page.
+class ReaderRoster:
+    def __init__(self, storage, history, journal=None):
+        self.storage = storage
+        self.history = history
+        self.journal = journal
+        self.readers = {} # name -> {"name", "start", "image", "count"}
+        self.names = []
+        self.stats = RosterStats()
+
+        rows = storage.readers()
+        if not rows:
+            for reader in DEFAULT_READERS:
+                storage.add_reader(reader["name"], reader["start"], reader["image"])
+            rows = storage.readers()
+        for row in rows:
+            self._remember(row)
+        self.names = sorted(self.readers, key=str.casefold)
+
+    def _remember(self, row):
+        reader = dict(row, count=row["start"] + self.history.reader_counts.get(row["name"], 0))
+        self.readers[reader["name"]] = reader
+        self.stats.add(reader["name"], reader["count"])
+        return reader
+
+    # Where `name` goes in the case-insensitive order
+    def _insert_row(self, name):
+        key = name.casefold()
+        return next((row for row, existing in enumerate(self.names) if existing.casefold() > key), len(self.names))
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self.readers
+
+    def get(self, name):
+        return self.readers.get(name)
+
+    def row(self, name):
+        return self.names.index(name)
+
+    # Absolute path of the reader's photo, or None
+    def image_path(self, name):
+        image = self.readers[name].get("image")
+        return os.path.join(APP_DIR, image) if image else None
+
+    # Counts one logged book, returns the reader's new total
+    def log_book(self, name, count=1):
+        reader = self.readers.get(name)
+        if reader is None:
+            return None
+        reader["count"] += count
+        self.stats.change(name, reader["count"] - count, reader["count"])
+        return reader["count"]
+
+    def _check_name(self, name):
+        name = " ".join((name or "").split())
+        if not name:
+            raise ValueError("A reader needs a name")
+        if name in self.readers:
+            raise ValueError(f"There is already a reader called {name}")
+        return name
+
+    # Adds a reader and returns their row in `names`, raises ValueError for an empty or taken name
+    def add_reader(self, name, start=0, image=None):
+        name = self._check_name(name)
+        try:
+            self.storage.add_reader(name, start, image)
+        except sqlite3.IntegrityError:
+            raise ValueError(f"There is already a reader called {name}")
+        self._remember({"name": name, "start": start, "image": image})
+        row = self._insert_row(name)
+        self.names.insert(row, name)
+        return row
+
+    def remove_reader(self, name):
+        if self.journal is not None:
+            self.journal.flush()
+        self.storage.remove_reader(name)
+        reader = self.readers.pop(name)
+        self.names.remove(name)
+        self.stats.remove(name, reader["count"])
+
+    # Renames a reader everywhere, queued readings are written first so none keep the old name
+    def rename_reader(self, old_name, new_name):
+        new_name = self._check_name(new_name)
+        if self.journal is not None:
+            self.journal.flush()
+        self.storage.rename_reader(old_name, new_name)
+        self.history.rename_reader(old_name, new_name)
+        discard_snapshot(SNAPSHOT_PATH) # Its totals are under the old name
+
+        reader = self.readers.pop(old_name)
+        reader["name"] = new_name
+        self.readers[new_name] = reader
+        self.stats.rename(old_name, new_name)
+        self.names.remove(old_name)
+        self.names.insert(self._insert_row(new_name), new_name)
+        return new_name
+
+    def set_image(self, name, image):
+        self.storage.set_reader_image(name, image)
+        self.readers[name]["image"] = image
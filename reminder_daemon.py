@@ -0,0 +1,99 @@
+import os
+import time
+import heapq
+import threading
+from datetime import datetime, timedelta
+from reminder_log import ReminderLog
+from sms_reminder import send_daily_sms, recipient_numbers
+
+DEFAULT_SEND_TIME = "20:00"
+
+
+# Reads per-recipient send times, e.g. REMINDER_TIMES="+17015550100=19:30,+14065550100=20:15".
+# Anyone not listed gets REMINDER_DEFAULT_TIME.
+def load_send_times():
+    default = os.getenv("REMINDER_DEFAULT_TIME", DEFAULT_SEND_TIME)
+    times = {number: default for number in recipient_numbers()}
+    for entry in os.getenv("REMINDER_TIMES", "").split(","):
+        if "=" in entry:
+            number, send_time = entry.split("=", 1)
+            times[number.strip()] = send_time.strip()
+    return times
+
+
+# Next time of day (HH:MM) strictly after `after`, as a timestamp
+def next_occurrence(send_time, after):
+    hour, minute = (int(part) for part in send_time.split(":"))
+    after_dt = datetime.fromtimestamp(after)
+    due = after_dt.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if due <= after_dt:
+        due += timedelta(days=1)
+    return due.timestamp()
+
+
+# Long-running reminder sender.
+# Upcoming sends sit in a min-heap so the daemon sleeps until the earliest one instead of polling.
+# Every send is written to the ReminderLog, and opted-out recipients are skipped but stay scheduled.
+class ReminderDaemon:
+    def __init__(self, send_times, log, send=send_daily_sms, clock=time.time):
+        self.send_times = send_times
+        self.log = log
+        self.send = send
+        self.clock = clock
+        self.heap = [] # (due_at, number)
+        self.wake = threading.Event()
+        self.stopped = False
+
+    # Works out each recipient's next send, never repeating one already logged
+    def schedule_all(self):
+        now = self.clock()
+        self.heap = []
+        for number, send_time in self.send_times.items():
+            last = self.log.last_sent(number) or 0
+            self.schedule(number, next_occurrence(send_time, max(now, last)))
+
+    def schedule(self, number, due_at):
+        heapq.heappush(self.heap, (due_at, number))
+        self.log.set_next_send(number, due_at)
+
+    # Sends everything due now, returns the number of messages sent
+    def run_due(self):
+        now = self.clock()
+        due = []
+        while self.heap and self.heap[0][0] <= now:
+            due_at, number = heapq.heappop(self.heap)
+            due.append(number)
+            self.schedule(number, next_occurrence(self.send_times[number], max(now, due_at)))
+
+        to_numbers = [number for number in due if not self.log.is_opted_out(number)]
+        if not to_numbers:
+            return 0
+
+        sent = 0
+        for result in self.send(to_numbers=to_numbers):
+            self.log.record_send(result["to"], result["sid"], result["error"])
+            if not result["error"]:
+                sent += 1
+        return sent
+
+    def run(self):
+        self.schedule_all()
+        while not self.stopped and self.heap:
+            delay = self.heap[0][0] - self.clock()
+            if delay > 0:
+                self.wake.wait(delay) # Sleeps until the next reminder or stop()
+                self.wake.clear()
+                continue
+            self.run_due()
+
+    def stop(self):
+        self.stopped = True
+        self.wake.set()
+
+
+def run_daemon():
+    daemon = ReminderDaemon(load_send_times(), ReminderLog(os.getenv("REMINDER_LOG", "reminders.db")))
+    try:
+        daemon.run()
+    except KeyboardInterrupt:
+        daemon.stop()
@@ -0,0 +1,77 @@
+import sqlite3
+import time
+
+
+# Every reminder sent, the next one due per recipient, and who has opted out.
+# Shared by the reminder daemon (writer) and the Notifications page (reader); every
+# query the page makes is answered from an index instead of scanning the log.
+class ReminderLog:
+    def __init__(self, path="reminders.db"):
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.create_tables()
+
+    def create_tables(self):
+        with self.db:
+            self.db.execute("""
+                CREATE TABLE IF NOT EXISTS sends (
+                    id INTEGER PRIMARY KEY,
+                    number TEXT NOT NULL,
+                    sent_at REAL NOT NULL,
+                    sid TEXT,
+                    error TEXT
+                )
+            """)
+            self.db.execute("CREATE INDEX IF NOT EXISTS sends_sent_at ON sends(sent_at)")
+            self.db.execute("CREATE INDEX IF NOT EXISTS sends_number ON sends(number, sent_at)")
+            self.db.execute("CREATE TABLE IF NOT EXISTS next_sends (number TEXT PRIMARY KEY, due_at REAL NOT NULL)")
+            self.db.execute("CREATE INDEX IF NOT EXISTS next_sends_due_at ON next_sends(due_at)")
+            self.db.execute("CREATE TABLE IF NOT EXISTS opt_outs (number TEXT PRIMARY KEY, opted_out_at REAL NOT NULL)")
+
+    def record_send(self, number, sid=None, error=None, sent_at=None):
+        with self.db:
+            self.db.execute("INSERT INTO sends (number, sent_at, sid, error) VALUES (?, ?, ?, ?)",
+                            (number, sent_at or time.time(), sid, error))
+
+    # Successful sends since a timestamp, for everyone or one recipient
+    def count_since(self, since, number=None):
+        if number is None:
+            row = self.db.execute(
+                "SELECT COUNT(*) FROM sends WHERE sent_at >= ? AND error IS NULL", (since,)).fetchone()
+        else:
+            row = self.db.execute(
+                "SELECT COUNT(*) FROM sends WHERE number = ? AND sent_at >= ? AND error IS NULL",
+                (number, since)).fetchone()
+        return row[0]
+
+    def last_sent(self, number):
+        row = self.db.execute(
+            "SELECT MAX(sent_at) FROM sends WHERE number = ? AND error IS NULL", (number,)).fetchone()
+        return row[0]
+
+    def set_next_send(self, number, due_at):
+        with self.db:
+            self.db.execute("INSERT OR REPLACE INTO next_sends (number, due_at) VALUES (?, ?)", (number, due_at))
+
+    # Earliest upcoming reminder for anyone still subscribed, or None
+    def next_send(self):
+        row = self.db.execute("""
+            SELECT MIN(due_at) FROM next_sends
+            WHERE number NOT IN (SELECT number FROM opt_outs)
+        """).fetchone()
+        return row[0]
+
+    def set_opt_out(self, number, opted_out=True):
+        with self.db:
+            if opted_out:
+                self.db.execute("INSERT OR REPLACE INTO opt_outs (number, opted_out_at) VALUES (?, ?)",
+                                (number, time.time()))
+            else:
+                self.db.execute("DELETE FROM opt_outs WHERE number = ?", (number,))
+
+    def is_opted_out(self, number):
+        return self.db.execute("SELECT 1 FROM opt_outs WHERE number = ?", (number,)).fetchone() is not None
+
+    def close(self):
+        self.db.close()
@@ -0,0 +1,164 @@
+import re
+from functools import lru_cache
+from collections import OrderedDict
+
+PUNCTUATION = re.compile(r"[^\w\s]")
+ISBN_CHARS = re.compile(r"[^0-9Xx]")
+TOKEN_MATCH = 0.5 # A query word this similar to a doc word counts as matching it
+# Words people add to a search that say nothing about which book they mean
+FILLER_WORDS = frozenset({"a", "an", "the", "and", "or", "of", "for", "about", "by", "to", "in", "on", "with",
+                          "book", "books", "kids", "children", "childrens"})
+
+
+# Casefolds and strips punctuation: "The Gruffalo's Child!" -> "the gruffalos child"
+def normalize_text(text):
+    return " ".join(PUNCTUATION.sub("", text.casefold()).split())
+
+
+# ISBN-13 check digit: digits weighted 1, 3, 1, 3... sum to a multiple of 10
+def isbn13_check_digit(body):
+    return str((10 - sum(int(d) * (1 if i % 2 == 0 else 3) for i, d in enumerate(body)) % 10) % 10)
+
+
+# ISBN-10 check digit: digits weighted 10 down to 2, plus the check, sum to a multiple of 11
+def isbn10_check_digit(body):
+    check = (11 - sum(int(d) * (10 - i) for i, d in enumerate(body)) % 11) % 11
+    return "X" if check == 10 else str(check)
+
+
+# Any ISBN-10 or ISBN-13 spelling as a bare ISBN-13, or None if it isn't one.
+# The check digit must be right and an ISBN-13 must be a Bookland (978/979) number,
+# so phone numbers, patron barcodes and other EANs are turned away.
+def normalize_isbn(raw):
+    isbn = ISBN_CHARS.sub("", raw or "").upper()
+    if len(isbn) == 13 and isbn.isdigit():
+        if isbn[:3] in ("978", "979") and isbn13_check_digit(isbn[:12]) == isbn[12]:
+            return isbn
+        return None
+    if len(isbn) == 10 and isbn[:9].isdigit() and isbn10_check_digit(isbn[:9]) == isbn[9]:
+        body = "978" + isbn[:9]
+        return body + isbn13_check_digit(body)
+    return None
+
+
+@lru_cache(maxsize=16384) # Titles and authors share most of their words
+def trigrams(token):
+    padded = f" {token} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+# Typo-tolerant similarity of two words, 1.0 when equal
+def token_similarity(query_token, query_grams, doc_token, doc_grams):
+    if query_token == doc_token:
+        return 1.0
+    if doc_token.startswith(query_token):
+        return 0.9 # Word still being typed
+    return 2 * len(query_grams & doc_grams) / (len(query_grams) + len(doc_grams))
+
+
+# True when `query` is `previous` with more typed, e.g. "gru" -> "gruffalo", or with words
+# added, e.g. "gruffalo" -> "the gruffalo", so results for `previous` are a superset worth refining
+def query_extends(previous, query):
+    previous = normalize_text(previous or "")
+    query = normalize_text(query)
+    if not previous or len(query) <= len(previous):
+        return False
+    if query.startswith(previous):
+        return True
+    return set(previous.split()) <= set(query.split())
+
+
+# Everything about a doc the ranker needs, worked out once per doc
+class DocFeatures:
+    def __init__(self, doc):
+        self.doc = doc
+        self.title = normalize_text(doc.get("title", ""))
+        words = self.title.split()
+        for author in doc.get("author_name", []):
+            words.extend(normalize_text(author).split())
+        self.tokens = [(word, trigrams(word)) for word in dict.fromkeys(words)]
+        self._isbns = None
+
+    # Normalized on first use, only ISBN queries look at them
+    @property
+    def isbns(self):
+        if self._isbns is None:
+            self._isbns = {isbn for isbn in map(normalize_isbn, self.doc.get("isbn", [])) if isbn}
+        return self._isbns
+
+
+# Ranks OpenLibrary docs against a query.
+# Exact ISBN matches (ISBN-10 and ISBN-13 treated as the same book) come first, then docs
+# by how well the query words match title or author words, tolerating typos. Filler words
+# ("books about", "for kids"), and in remote results query words that match nothing in the
+# whole batch, are left out of the score instead of sinking every doc. A whole batch is scored in one pass over features
+# that are computed once per doc.
+class ResultRanker:
+    def __init__(self, min_score=0.6, max_cached_docs=2000):
+        self.min_score = min_score # Only used to trim results when refining locally
+        self.max_cached_docs = max_cached_docs
+        self.features = OrderedDict() # id(doc) -> DocFeatures, kept while the doc is cached
+
+    def features_for(self, doc):
+        features = self.features.get(id(doc))
+        if features is None or features.doc is not doc:
+            features = DocFeatures(doc)
+            self.features[id(doc)] = features
+            while len(self.features) > self.max_cached_docs:
+                self.features.popitem(last=False)
+        return features
+
+    # Best similarity of each query word to any of the doc's words
+    def token_scores(self, query_tokens, features):
+        if not features.tokens:
+            return [0.0] * len(query_tokens)
+        return [max(token_similarity(token, grams, doc_token, doc_grams) for doc_token, doc_grams in features.tokens)
+                for token, grams in query_tokens]
+
+    def score(self, token_scores, counted, query_text, features):
+        if not counted:
+            return 0.0
+        score = sum(token_scores[i] for i in counted) / len(counted)
+        if query_text and query_text in features.title:
+            score += 0.2 # Whole phrase appears in the title
+        return score
+
+    # Returns every doc, best first. With `min_score` docs scoring below it are dropped.
+    def rank(self, query, docs, min_score=None, refining=False):
+        query_isbn = normalize_isbn(query)
+        query_text = normalize_text(query)
+        query_tokens = [(token, trigrams(token)) for token in query_text.split()]
+
+        isbn_matches = []
+        candidates = []
+        for position, doc in enumerate(docs):
+            features = self.features_for(doc)
+            if query_isbn and query_isbn in features.isbns:
+                isbn_matches.append(doc)
+            else:
+                candidates.append((position, doc, features, self.token_scores(query_tokens, features)))
+
+        # Filler words don't count, unless that would leave nothing to score. Remote results
+        # also skip words matching nothing anywhere in the batch, refined ones can't.
+        counted = [i for i, (token, _) in enumerate(query_tokens) if token not in FILLER_WORDS]
+        matched = [i for i in counted if any(scores[i] >= TOKEN_MATCH for _, _, _, scores in candidates)]
+        if not refining:
+            counted = matched or counted
+        elif matched != counted:
+            return [] # The new words aren't in these docs, only the network can answer
+        if not counted:
+            counted = list(range(len(query_tokens)))
+
+        scored = []
+        for position, doc, features, scores in candidates:
+            score = self.score(scores, counted, query_text, features)
+            if min_score is None or score >= min_score:
+                scored.append((-score, position, doc))
+
+        scored.sort()
+        return isbn_matches + [doc for _, _, doc in scored]
+
+    # Narrows already fetched docs to a longer query, keeping only good matches.
+    # Returns nothing when any word of the query is in none of the docs.
+    def refine(self, query, docs):
+        return self.rank(query, docs, min_score=self.min_score, refining=True)
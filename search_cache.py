@@ -0,0 +1,127 @@
+import os
+import json
+import time
+import sqlite3
+from collections import OrderedDict
+
+
+# Turns a query into the form used for cache keys
+def normalize_query(query):
+    return " ".join(query.casefold().split())
+
+
+# Two-tier cache for OpenLibrary search results.
+# Recent queries live in an in-memory LRU, everything else in a small SQLite file with a TTL.
+class SearchCache:
+    def __init__(self, path="cache/search_cache.sqlite3", max_memory_entries=64,
+                 max_disk_entries=500, ttl_seconds=24 * 60 * 60):
+        self.path = path
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+        self.ttl_seconds = ttl_seconds
+        self.memory = OrderedDict() # key -> (stored_at, docs)
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.db = None
+
+    def _connect(self):
+        if self.db is None:
+            folder = os.path.dirname(self.path)
+            if folder:
+                os.makedirs(folder, exist_ok=True)
+            self.db = sqlite3.connect(self.path)
+            # A cache can lose its last writes in a crash, it can't afford an fsync per put
+            self.db.execute("PRAGMA journal_mode=WAL")
+            self.db.execute("PRAGMA synchronous=NORMAL")
+            self.db.execute("""
+                CREATE TABLE IF NOT EXISTS searches (
+                    key TEXT PRIMARY KEY,
+                    docs TEXT NOT NULL,
+                    stored_at REAL NOT NULL
+                )
+            """)
+            self.db.execute("CREATE INDEX IF NOT EXISTS searches_stored_at ON searches(stored_at)")
+        return self.db
+
+    def make_key(self, query, limit, offset=0):
+        return f"{normalize_query(query)}|{limit}|{offset}"
+
+    # Returns cached docs for the query, or None on a miss
+    def get(self, query, limit, offset=0):
+        key = self.make_key(query, limit, offset)
+        now = time.time()
+
+        entry = self.memory.get(key)
+        if entry is not None:
+            stored_at, docs = entry
+            if now - stored_at < self.ttl_seconds:
+                self.memory.move_to_end(key)
+                self.hits += 1
+                return docs
+            del self.memory[key]
+
+        try:
+            row = self._connect().execute(
+                "SELECT docs, stored_at FROM searches WHERE key = ?", (key,)).fetchone()
+        except sqlite3.Error:
+            row = None
+
+        if row is not None and now - row[1] < self.ttl_seconds:
+            docs = json.loads(row[0])
+            self._remember(key, row[1], docs)
+            self.hits += 1
+            self.disk_hits += 1
+            return docs
+
+        self.misses += 1
+        return None
+
+    def put(self, query, limit, docs, offset=0):
+        self.put_many([(query, docs)], limit, offset)
+
+    # Stores several (query, docs) results in one transaction with one prune
+    def put_many(self, results, limit, offset=0):
+        if not results:
+            return
+        stored_at = time.time()
+        rows = []
+        for query, docs in results:
+            key = self.make_key(query, limit, offset)
+            self._remember(key, stored_at, docs)
+            rows.append((key, json.dumps(docs), stored_at))
+
+        try:
+            db = self._connect()
+            with db:
+                db.executemany("INSERT OR REPLACE INTO searches (key, docs, stored_at) VALUES (?, ?, ?)", rows)
+                # Drop expired rows and keep only the newest max_disk_entries
+                db.execute("DELETE FROM searches WHERE stored_at < ?", (stored_at - self.ttl_seconds,))
+                db.execute("""
+                    DELETE FROM searches WHERE key NOT IN (
+                        SELECT key FROM searches ORDER BY stored_at DESC LIMIT ?
+                    )
+                """, (self.max_disk_entries,))
+        except sqlite3.Error:
+            pass # The memory tier still works if the disk is unavailable
+
+    def _remember(self, key, stored_at, docs):
+        self.memory[key] = (stored_at, docs)
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.max_memory_entries:
+            self.memory.popitem(last=False)
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "disk_hits": self.disk_hits,
+            "hit_rate": self.hits / total if total else 0.0,
+            "memory_entries": len(self.memory)
+        }
+
+    def close(self):
+        if self.db is not None:
+            self.db.close()
+            self.db = None
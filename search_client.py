@@ -0,0 +1,114 @@
+import json
+import time
+from PyQt5.QtCore import QObject, QUrl, QUrlQuery, pyqtSignal
+from PyQt5.QtNetwork import QNetworkRequest, QNetworkReply
+from instrumentation import instruments
+
+
+# Runs OpenLibrary searches through a QNetworkAccessManager so the GUI thread never blocks.
+# Only one search is in flight at a time, a newer query aborts the older one and
+# results are handed back by signal. Answers are served from the cache when possible, then
+# from the offline catalog if one is built, and only then from OpenLibrary. A query's later
+# pages come from whichever source answered its first page, the two never mix offsets.
+class SearchClient(QObject):
+    results_ready = pyqtSignal(str, list, int) # query, docs, offset of the first doc
+    search_failed = pyqtSignal(str, str) # query, error message
+
+    def __init__(self, search_url, network_manager, cache=None, local_catalog=None,
+                 remote_fallback=True, timeout_ms=10000, parent=None):
+        super().__init__(parent)
+        self.search_url = search_url
+        self.network_manager = network_manager
+        self.cache = cache
+        self.local_catalog = local_catalog
+        self.remote_fallback = remote_fallback
+        self.timeout_ms = timeout_ms
+        self.current_reply = None
+        self.generation = 0 # Bumped on every new search so stale replies can be ignored
+        self.local_query = None # Query whose first page came from the offline catalog
+
+    # Starts a search (or fetches a later page) and cancels whatever is still in flight
+    def search(self, query, limit=20, offset=0):
+        self.cancel()
+        generation = self.generation
+        started = time.perf_counter()
+
+        if offset == 0:
+            self.local_query = None
+        elif query == self.local_query:
+            # Paging through a catalog result set, running out ends it rather than switching sources
+            with instruments.timer("search.local_catalog"):
+                docs = self.local_catalog.search(query, limit, offset)
+            self.results_ready.emit(query, docs, offset)
+            return
+
+        if self.cache is not None:
+            docs = self.cache.get(query, limit, offset)
+            if docs is not None:
+                instruments.record("search.cache", time.perf_counter() - started)
+                self.results_ready.emit(query, docs, offset)
+                return
+
+        # The offline catalog answers in milliseconds, OpenLibrary is only asked if it has nothing
+        if self.local_catalog is not None and offset == 0:
+            with instruments.timer("search.local_catalog"):
+                docs = self.local_catalog.search(query, limit, offset)
+            if docs or not self.remote_fallback or not self.search_url:
+                self.local_query = query
+                self.results_ready.emit(query, docs, offset)
+                return
+
+        url = QUrl(self.search_url)
+        params = QUrlQuery()
+        params.addQueryItem("q", query)
+        params.addQueryItem("limit", str(limit))
+        if offset:
+            params.addQueryItem("offset", str(offset))
+        url.setQuery(params)
+
+        request = QNetworkRequest(url)
+        request.setTransferTimeout(self.timeout_ms)
+        reply = self.network_manager.get(request)
+        reply.finished.connect(lambda: self.handle_reply(reply, query, limit, offset, generation, started))
+        self.current_reply = reply
+
+    # Answers from the offline catalog alone, empty when there is none or nothing matches
+    def search_local(self, query, limit=20):
+        if self.local_catalog is None:
+            return []
+        with instruments.timer("search.local_catalog"):
+            return self.local_catalog.search(query, limit)
+
+    # Aborts the in-flight search, its reply will finish as stale and be dropped
+    def cancel(self):
+        self.generation += 1
+        reply = self.current_reply
+        self.current_reply = None
+        if reply is not None and reply.isRunning():
+            reply.abort()
+
+    def handle_reply(self, reply, query, limit, offset, generation, started):
+        reply.deleteLater()
+
+        # A newer search has started since this one was sent
+        if generation != self.generation:
+            instruments.count("search.cancelled")
+            return
+        self.current_reply = None
+        instruments.record("search.network", time.perf_counter() - started)
+
+        if reply.error() != QNetworkReply.NoError:
+            self.search_failed.emit(query, reply.errorString())
+            return
+
+        try:
+            with instruments.timer("search.parse"):
+                data = json.loads(bytes(reply.readAll()))
+        except ValueError:
+            self.search_failed.emit(query, "Invalid response from OpenLibrary")
+            return
+
+        docs = data.get("docs", [])
+        if self.cache is not None:
+            self.cache.put(query, limit, docs, offset)
+        self.results_ready.emit(query, docs, offset)
@@ -0,0 +1,114 @@
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http_client import shared_client, TIMEOUT_SECONDS
+
+
+# Raised by a transport when the send may succeed if tried again (rate limited, 5xx, network)
+class TransientSendError(Exception):
+    pass
+
+
+# Sends through the Twilio REST client, riding on the shared pooled session
+class TwilioTransport:
+    def __init__(self, account_sid, auth_token, client=None):
+        if client is None:
+            from twilio.rest import Client
+            from twilio.http.http_client import TwilioHttpClient
+            http_client = TwilioHttpClient(timeout=TIMEOUT_SECONDS)
+            http_client.session = shared_client().session
+            client = Client(account_sid, auth_token, http_client=http_client)
+        self.client = client
+
+    def send(self, to, from_, body):
+        from twilio.base.exceptions import TwilioRestException
+        try:
+            message = self.client.messages.create(body=body, from_=from_, to=to)
+        except TwilioRestException as error:
+            if error.status == 429 or (error.status or 0) >= 500:
+                raise TransientSendError(str(error)) from error
+            raise
+        except OSError as error:
+            raise TransientSendError(str(error)) from error
+        return message.sid
+
+
+# Posts to any endpoint that speaks Twilio's Messages API, e.g. a local fake in tests
+class HttpTransport:
+    def __init__(self, base_url, account_sid, auth_token, session=None, timeout=TIMEOUT_SECONDS):
+        self.url = f"{base_url.rstrip('/')}/2010-04-01/Accounts/{account_sid}/Messages.json"
+        self.auth = (account_sid, auth_token)
+        self.session = session or shared_client().session
+        self.timeout = timeout
+
+    def send(self, to, from_, body):
+        import requests
+        try:
+            response = self.session.post(self.url, data={"To": to, "From": from_, "Body": body},
+                                         auth=self.auth, timeout=self.timeout)
+        except requests.RequestException as error:
+            raise TransientSendError(str(error)) from error
+        if response.status_code == 429 or response.status_code >= 500:
+            raise TransientSendError(f"HTTP {response.status_code}")
+        response.raise_for_status()
+        return response.json().get("sid")
+
+
+# Thread-safe token bucket, allows `rate` sends per second with short bursts up to `burst`
+class RateLimiter:
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+# Sends one message to many recipients through a bounded thread pool.
+# Every send waits for the rate limiter, transient failures are retried with exponential
+# backoff, and one recipient failing never stops the others. The burst is separate from
+# the pool size, so more workers never means more sends per second than the rate.
+class SmsFanout:
+    def __init__(self, transport, from_number, max_workers=4, rate_per_second=1.0, burst=1,
+                 max_retries=3, backoff_seconds=1.0, sleep=time.sleep):
+        self.transport = transport
+        self.from_number = from_number
+        self.max_workers = max_workers
+        self.limiter = RateLimiter(rate_per_second, burst=burst)
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.sleep = sleep
+
+    # Returns one result dict per recipient, in the order given
+    def send_all(self, to_numbers, body):
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            return list(pool.map(lambda number: self.send_one(number, body), to_numbers))
+
+    def send_one(self, to, body):
+        result = {"to": to, "sid": None, "error": None, "attempts": 0}
+        while True:
+            self.limiter.acquire()
+            result["attempts"] += 1
+            try:
+                result["sid"] = self.transport.send(to, self.from_number, body)
+                return result
+            except TransientSendError as error:
+                if result["attempts"] > self.max_retries:
+                    result["error"] = str(error)
+                    return result
+                self.sleep(self.backoff_seconds * 2 ** (result["attempts"] - 1))
+            except Exception as error:
+                result["error"] = str(error)
+                return result
@@ -1,9 +1,8 @@
 import os
-import time
+import sys
 import random
-import schedule
 from dotenv import load_dotenv
-from twilio.rest import Client
+from sms_fanout import SmsFanout, TwilioTransport, HttpTransport
 
 # Load environment variables
 load_dotenv()
@@ -21,27 +20,60 @@ messages = [
 ]
 
 
-def send_daily_sms():
+# Transports are kept so repeat sends (e.g. from the daemon) reuse warm connections
+transports = {}
+
+
+# Picks the transport: a local Twilio-compatible endpoint if SMS_TRANSPORT_URL is set, otherwise Twilio
+def make_transport(account_sid, auth_token):
+    base_url = os.getenv("SMS_TRANSPORT_URL")
+    key = (base_url, account_sid, auth_token)
+    if key not in transports:
+        if base_url:
+            transports[key] = HttpTransport(base_url, account_sid, auth_token)
+        else:
+            transports[key] = TwilioTransport(account_sid, auth_token)
+    return transports[key]
+
+
+def recipient_numbers():
+    return [n.strip() for n in os.getenv("RECIPIENT_PHONE_NUMBER", "").split(",") if n.strip()]
+
+
+def send_daily_sms(transport=None, to_numbers=None):
     account_sid = os.getenv("TWILIO_ACCOUNT_SID")
     auth_token = os.getenv("TWILIO_AUTH_TOKEN")
     from_number = os.getenv("TWILIO_PHONE_NUMBER")
-    to_numbers = [n.strip() for n in os.getenv("RECIPIENT_PHONE_NUMBER").split(",")]
+    if to_numbers is None:
+        to_numbers = recipient_numbers()
 
-    client = Client(account_sid, auth_token)
+    fanout = SmsFanout(
+        transport or make_transport(account_sid, auth_token),
+        from_number,
+        max_workers=int(os.getenv("SMS_MAX_WORKERS", "4")),
+        rate_per_second=float(os.getenv("SMS_RATE_PER_SECOND", "1")),
+        burst=int(os.getenv("SMS_BURST", "1")),
+        max_retries=int(os.getenv("SMS_MAX_RETRIES", "3"))
+    )
     message_body = random.choice(messages)
 
-    for number in to_numbers:
-        message = client.messages.create(
-            body=message_body,
-            from_=from_number,
-            to=number
-        )
-        print(f"Sent message: {message.sid}")
+    results = fanout.send_all(to_numbers, message_body)
+    for result in results:
+        if result["error"]:
+            print(f"Failed to send to {result['to']} after {result['attempts']} attempts: {result['error']}")
+        else:
+            print(f"Sent message: {result['sid']}")
+    return results
         
 
 
 
 
 
+# python sms_reminder.py sends once, python sms_reminder.py --daemon keeps running on schedule
 if __name__ == "__main__":
-    send_daily_sms()
\ No newline at end of file
+    if "--daemon" in sys.argv:
+        from reminder_daemon import run_daemon
+        run_daemon()
+    else:
+        send_daily_sms()
\ No newline at end of file
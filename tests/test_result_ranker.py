@@ -0,0 +1,34 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from result_ranker import ResultRanker, query_extends
+
+DINOSAUR_TITLES = ["Dinosaur Stomp", "Dinosaur Dig", "Dinosaur Bones", "Dinosaur Train", "Dinosaur Farm",
+                   "How Do Dinosaurs Say Goodnight", "Dinosaur Dance", "The Dinosaur Lady"]
+
+
+def docs(titles):
+    return [{"title": title, "author_name": ["Someone"]} for title in titles]
+
+
+def test_refine_drops_results_when_a_new_word_matches_no_doc():
+    assert query_extends("dinosaur", "dinosaur roar")
+    assert ResultRanker().refine("dinosaur roar", docs(DINOSAUR_TITLES)) == []
+
+
+def test_refine_keeps_docs_matching_every_new_word():
+    refined = ResultRanker().refine("dinosaur dig", docs(DINOSAUR_TITLES))
+    assert [doc["title"] for doc in refined][:1] == ["Dinosaur Dig"]
+
+
+def test_rank_keeps_remote_docs_when_a_word_matches_nothing():
+    ranked = ResultRanker().rank("dinosaur roar", docs(DINOSAUR_TITLES))
+    assert len(ranked) == len(DINOSAUR_TITLES)
+
+
+def test_a_different_last_word_is_not_an_extension():
+    assert not query_extends("goodnight moon", "goodnight gorilla")
+    assert query_extends("gruffalo", "the gruffalo")
+    assert query_extends("gru", "gruffalo")
@@ -0,0 +1,125 @@
+from string import Template
+from instrumentation import instruments
+
+# Background colors for each tab, by stack slot
+TAB_COLORS = {
+    0: "#487347",
+    1: "#5478ab",
+    2: "#cf9851",
+    3: "#ab616e"
+}
+FALLBACK_COLOR = "#999da1" # Book Lists and anything else without its own color
+
+# Widgets are matched by object name, state that changes at runtime is a dynamic property
+STYLESHEET = Template("""
+QLabel#header {
+    font-size: 30px;
+    font-weight: bold;
+    padding-top: 70px;
+    background-color: $fallback;
+}
+QWidget#footer {
+    background-color: $fallback;
+}
+$tab_rules
+QPushButton#navButton {
+    border-radius: 30px;
+    background-color: none;
+    border: none;
+}
+QPushButton#navButton:hover {
+    background-color: #ede4e4;
+}
+QPushButton#navButton:pressed {
+    background-color: #bfb6b6;
+}
+
+QLineEdit#searchInput {
+    font: 14px;
+    height: 30px;
+    border-top-left-radius: 15px;
+    border-bottom-left-radius: 15px;
+    padding: 2px 15px;
+}
+QPushButton#searchButton {
+    font: 14px;
+    height: 30px;
+    border-top-right-radius: 15px;
+    border-bottom-right-radius: 15px;
+    background-color: #5478ab;
+    padding: 2px 10px;
+}
+QPushButton#searchButton:hover {
+    background-color: rgba(84, 120, 171, 0.9);
+}
+QPushButton#searchButton:pressed {
+    background-color: rgba(84, 120, 171, 0.7);
+}
+
+QLabel#pageTitle {
+    font-size: 22px;
+    font-weight: bold;
+}
+QLabel#sectionTitle {
+    font-size: 18px;
+    font-weight: bold;
+}
+QLabel#summaryText {
+    font-size: 16px;
+}
+QLabel#bodyText {
+    font-size: 15px;
+}
+QLabel#bodyText[spaced="true"] {
+    padding-bottom: 20px;
+}
+QPushButton#optOutToggle {
+    background-color: #cf9851;
+    color: white;
+    padding: 8px;
+    border-radius: 16px;
+}
+QPushButton#optOutToggle:checked {
+    background-color: #999da1;
+}
+
+QLabel#metricsOverlay {
+    background-color: rgba(0, 0, 0, 170);
+    color: #e6e6e6;
+    font-family: monospace;
+    font-size: 11px;
+    padding: 6px;
+    border-radius: 6px;
+}
+""")
+
+TAB_RULE = Template("""QLabel#header[tab="$tab"], QWidget#footer[tab="$tab"] {
+    background-color: $color;
+}""")
+
+
+# The whole app's stylesheet, one rule per tab color instead of a stylesheet per switch
+def compile_stylesheet(tab_colors=TAB_COLORS, fallback=FALLBACK_COLOR):
+    tab_rules = "\n".join(TAB_RULE.substitute(tab=tab, color=color) for tab, color in tab_colors.items())
+    return STYLESHEET.substitute(tab_rules=tab_rules, fallback=fallback)
+
+
+# Compiles and installs the stylesheet on the application, Qt parses it once here.
+# Calling it again with the same colors leaves the application alone.
+def apply_theme(app, tab_colors=TAB_COLORS):
+    with instruments.timer("style.compile"):
+        stylesheet = compile_stylesheet(tab_colors)
+    if app.styleSheet() != stylesheet:
+        with instruments.timer("style.apply"):
+            app.setStyleSheet(stylesheet)
+
+
+# Flips a dynamic property and re-polishes just this widget against the parsed stylesheet
+def set_style_property(widget, name, value):
+    if widget.property(name) == value:
+        return
+    with instruments.timer("style.repolish"):
+        widget.setProperty(name, value)
+        style = widget.style()
+        style.unpolish(widget)
+        style.polish(widget)